@@ -20,8 +20,11 @@ Phase 2 (master_agent_consolidate):
 """
 
 import os
+import hashlib
 import json as _json
-from services.supabase_client import push_to_table
+from datetime import datetime
+import numpy as np
+from services.supabase_client import push_to_table_async, to_json_safe
 
 
 # ─── Role-specific summary builders ──────────────────────────────────────────
@@ -75,6 +78,19 @@ def _prepare_pricing_summary(rfp: dict) -> dict:
     }
 
 
+def _py(x):
+    """Unwrap a numpy scalar to the plain Python number; anything else passes through."""
+    return x.item() if hasattr(x, "item") else x
+
+
+def _plain_score(rfp_score: dict) -> dict:
+    """Score breakdown with numpy scalars unwrapped (one level of nested dicts)."""
+    return {
+        k: {ck: _py(cv) for ck, cv in v.items()} if isinstance(v, dict) else _py(v)
+        for k, v in rfp_score.items()
+    }
+
+
 # ─── Phase 1: Select RFP + dispatch summaries ─────────────────────────────────
 
 def master_agent_start(state: dict) -> dict:
@@ -91,18 +107,20 @@ def master_agent_start(state: dict) -> dict:
         product_db
 
     Writes to state:
+        scores              — float64 array of final scores, aligned with rfps
         selected_rfp        — the chosen RFP dict
         rfp_score           — bid viability score breakdown
         technical_summary   — summary for technical_agent
         pricing_summary     — summary for pricing_agent
     """
-    from agents.scoring_agent import RFPScorer, score_single_rfp
+    from agents.scoring_agent import RFPScorer, score_single_rfp, score_rfps
 
     rfps       = state.get("rfps", [])
     product_db = state["product_db"]
 
     if not rfps:
         print("❌ Master Agent: No RFPs received from Sales Agent.")
+        state["scores"]            = np.empty(0, dtype=np.float64)
         state["selected_rfp"]      = None
         state["rfp_score"]         = {}
         state["technical_summary"] = {}
@@ -110,32 +128,35 @@ def master_agent_start(state: dict) -> dict:
         return state
 
     scorer = RFPScorer(product_db)
+    now    = datetime.now()
 
     # ── Score every shortlisted RFP ───────────────────────────────────────
     if len(rfps) == 1:
         selected   = rfps[0]
-        rfp_score  = score_single_rfp(scorer, selected, product_db)
+        rfp_score  = score_single_rfp(scorer, selected, product_db, now)
+        scores     = np.asarray([rfp_score["final_score"]], dtype=np.float64)
         print(f"✅ Master Agent: 1 RFP received — '{selected.get('projectName', 'Unnamed')}'")
         print(f"   Bid Viability Score : {rfp_score['final_score']}/100 ({rfp_score['grade']})")
         print(f"   Recommendation      : {rfp_score['recommendation']}")
     else:
         print(f"📊 Master Agent: Scoring {len(rfps)} shortlisted RFP(s)...\n")
-        scored = []
-        for rfp in rfps:
-            sc = score_single_rfp(scorer, rfp, product_db)
-            scored.append((rfp, sc))
+        # Results (and the log) stay in RFP order
+        scored = list(zip(rfps, score_rfps(scorer, rfps, now)))
+        for rfp, sc in scored:
             print(f"   • {rfp.get('projectName', 'Unnamed'):<50} "
                   f"Score: {sc['final_score']:5.1f}/100  Grade: {sc['grade']}")
 
-        # Pick highest scoring RFP
-        scored.sort(key=lambda x: x[1]['final_score'], reverse=True)
-        selected, rfp_score = scored[0]
+        # Pick highest scoring RFP (argmax keeps the first on ties)
+        scores = np.asarray([sc['final_score'] for _, sc in scored], dtype=np.float64)
+        selected, rfp_score = scored[int(scores.argmax())]
 
         print(f"\n✅ Master Agent selected: '{selected.get('projectName', 'Unnamed')}'")
         print(f"   Score       : {rfp_score['final_score']}/100 ({rfp_score['grade']})")
         print(f"   Deadline    : {selected.get('submissionDeadline', 'N/A')}")
         print(f"   Recommendation: {rfp_score['recommendation']}")
 
+    rfp_score = _plain_score(rfp_score)
+    state["scores"]       = scores
     state["selected_rfp"] = selected
     state["rfp_score"]    = rfp_score
 
@@ -150,12 +171,12 @@ def master_agent_start(state: dict) -> dict:
 
     # ── Push scoring results to Supabase ──────────────────────────────────
     try:
-        push_to_table("scoring_results", {
+        push_to_table_async("scoring_results", {
             "project_name":  selected.get("projectName", "unknown"),
             "final_score":   rfp_score["final_score"],
             "grade":         rfp_score["grade"],
             "recommendation": rfp_score["recommendation"],
-            "full_output":   _json.loads(_json.dumps(rfp_score, default=str)),
+            "full_output":   to_json_safe(rfp_score),
         })
     except Exception as e:
         print(f"⚠️  Failed to push scoring results to DB: {e}")
@@ -165,6 +186,18 @@ def master_agent_start(state: dict) -> dict:
 
 # ─── Phase 2: Consolidate + generate report ───────────────────────────────────
 
+# Last rendered report as one immutable (key, bytes) pair, so concurrent
+# requests never see one report's key with another's bytes. The report stamps
+# "Generated <date> at HH:MM", so the key includes the current minute.
+_last_pdf = (None, None)
+
+
+def _pdf_cache_key(final_response: dict) -> str:
+    payload = _json.dumps(final_response, sort_keys=True, default=str)
+    stamp   = datetime.now().strftime("%Y-%m-%d %H:%M")
+    return hashlib.blake2b(f"{stamp}|{payload}".encode()).hexdigest()
+
+
 def master_agent_consolidate(state: dict) -> dict:
     """
     PHASE 2 — End of the conversation.
@@ -242,10 +275,18 @@ def master_agent_consolidate(state: dict) -> dict:
     state["final_response"] = final_response
 
     # ── Generate PDF (in-memory, no file saved) ─────────────────────────
+    global _last_pdf
     try:
-        pdf_bytes = generate_rfp_pdf(rfp_data=final_response)
+        pdf_key = _pdf_cache_key(final_response)
+        cached_key, cached_bytes = _last_pdf
+        if pdf_key == cached_key:
+            pdf_bytes = cached_bytes
+            print(f"♻️  PDF report unchanged — reusing previous render ({len(pdf_bytes):,} bytes)")
+        else:
+            pdf_bytes = generate_rfp_pdf(rfp_data=final_response)
+            _last_pdf = (pdf_key, pdf_bytes)
+            print(f"✅ PDF report generated in memory ({len(pdf_bytes):,} bytes)")
         state["pdf_bytes"] = pdf_bytes
-        print(f"✅ PDF report generated in memory ({len(pdf_bytes):,} bytes)")
     except Exception as e:
         print(f"❌ PDF generation failed: {e}")
         state["pdf_bytes"] = None
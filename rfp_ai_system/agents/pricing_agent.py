@@ -26,8 +26,11 @@ Fix 3 — Voltage-class-aware test selection
 """
 
 import re
+import sys
+import numpy as np
+from functools import lru_cache
 from typing import List, Dict, Optional
-from services.supabase_client import push_to_table
+from services.supabase_client import push_to_table_async, to_json_safe
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -62,6 +65,35 @@ TEST_KEYWORD_MAP = {
     r'electrical\s*(?:test|testing)': ["ET-01", "ET-02"],
 }
 
+# Compiled once at import; IGNORECASE replaces the per-call .lower()
+_COMPILED_TEST_KEYWORDS = [
+    (re.compile(pattern, re.IGNORECASE), codes)
+    for pattern, codes in TEST_KEYWORD_MAP.items()
+]
+
+# One pass per string: named groups say which branch matched. The first
+# branch wins wherever it occurs; the second is only a fallback.
+_QTY_RE = re.compile(
+    r'(?:quantity|qty)\s*[:\-]?\s*(?P<qty>[\d,]+)\s*(?:m\b|meters?|metres?)'
+    r'|(?P<n>[\d,]+)\s*(?:meters?|metres?)',
+    re.IGNORECASE,
+)
+_KV_RE = re.compile(r'(?P<kv>\d+(?:\.\d+)?)\s*kv|(?P<v>\d+)\s*v\b', re.IGNORECASE)
+
+
+def _first_preferred(pattern, text: str, preferred: str, fallback: str):
+    """
+    Scan text once and return (group_name, value) for the first match of the
+    preferred branch, else the first match of the fallback branch, else None.
+    """
+    first_fallback = None
+    for m in pattern.finditer(text):
+        if m.group(preferred) is not None:
+            return preferred, m.group(preferred)
+        if first_fallback is None:
+            first_fallback = m.group(fallback)
+    return (fallback, first_fallback) if first_fallback is not None else None
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # FIX 1 & 2 — RFP Quantity extraction + Volume Discount pricing
@@ -75,56 +107,60 @@ def extract_rfp_quantity(line_item_text: str) -> Optional[int]:
       "Quantity: 1900 meters"   "Qty: 1900 m"   "1,900 m"   "1900m"
     Returns None if no quantity found.
     """
-    text = line_item_text.lower()
+    hit = _first_preferred(_QTY_RE, line_item_text, "qty", "n")
+    if hit:
+        return int(hit[1].replace(",", ""))
 
-    # Explicit "quantity: NNN" or "qty: NNN"
-    m = re.search(r'(?:quantity|qty)\s*[:\-]?\s*([\d,]+)\s*(?:m\b|meters?|metres?)', text)
-    if m:
-        return int(m.group(1).replace(",", ""))
+    return None
 
-    # Standalone "NNN meters" (fallback)
-    m = re.search(r'([\d,]+)\s*(?:meters?|metres?)', text)
-    if m:
-        return int(m.group(1).replace(",", ""))
 
-    return None
+def index_volume_discounts(volume_discounts_db) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Group the Volume Discounts sheet by Product_ID once per run.
 
+    Returns {product_id: array of (min_qty, max_qty, unit_price) bands} in
+    sheet order, or None when the sheet is not loaded.
+    """
+    if volume_discounts_db is None:
+        return None
+
+    band_cols = ["Min_Quantity_Meters", "Max_Quantity_Meters", "Unit_Price_INR"]
+    return {
+        product_id: bands[band_cols].to_numpy(dtype=np.float64)
+        for product_id, bands in volume_discounts_db.groupby("Product_ID", sort=False)
+    }
 
-def get_discounted_unit_price(product_id: str, order_qty: int, volume_discounts_db) -> Optional[float]:
+
+def get_discounted_unit_price(product_id: str, order_qty: int, discount_index) -> Optional[float]:
     """
     FIX 2 — Look up the correct discounted unit price for a given order quantity.
 
-    Searches the Volume Discounts sheet for rows matching product_id where
-    Min_Quantity_Meters <= order_qty <= Max_Quantity_Meters.
+    Searches the product's bands (from index_volume_discounts) for the first
+    one where Min_Quantity_Meters <= order_qty <= Max_Quantity_Meters.
 
     Returns discounted unit price, or None if no match (caller falls back to
     catalogue price).
     """
-    if volume_discounts_db is None:
+    if discount_index is None:
         return None
 
-    rows = volume_discounts_db[volume_discounts_db["Product_ID"] == product_id]
-    if rows.empty:
+    bands = discount_index.get(product_id)
+    if bands is None:
         return None
 
-    matched = rows[
-        (rows["Min_Quantity_Meters"] <= order_qty) &
-        (rows["Max_Quantity_Meters"] >= order_qty)
-    ]
-    if matched.empty:
-        # order_qty exceeds all bands — use the highest-quantity band
-        matched = rows[rows["Min_Quantity_Meters"] == rows["Min_Quantity_Meters"].max()]
-
-    if matched.empty:
-        return None
+    matched = np.flatnonzero((bands[:, 0] <= order_qty) & (bands[:, 1] >= order_qty))
+    if matched.size:
+        return float(bands[matched[0], 2])
 
-    return float(matched["Unit_Price_INR"].iloc[0])
+    # order_qty exceeds all bands — use the highest-quantity band
+    return float(bands[bands[:, 0].argmax(), 2])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # FIX 3 — Voltage-class-aware test selection
 # ─────────────────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=128)
 def _voltage_class(voltage_rating_str: str) -> str:
     """
     Classify a voltage string into LV / MV / HV.
@@ -137,17 +173,11 @@ def _voltage_class(voltage_rating_str: str) -> str:
     if not voltage_rating_str:
         return "LV"   # safe default
 
-    # Extract numeric kV value
-    m = re.search(r'(\d+(?:\.\d+)?)\s*kv', voltage_rating_str.lower())
-    if not m:
-        # Try bare volts, e.g. "415 V"
-        m = re.search(r'(\d+)\s*v\b', voltage_rating_str.lower())
-        if m:
-            kv = float(m.group(1)) / 1000
-        else:
-            return "LV"
-    else:
-        kv = float(m.group(1))
+    # Extract numeric kV value, falling back to bare volts, e.g. "415 V"
+    hit = _first_preferred(_KV_RE, voltage_rating_str, "kv", "v")
+    if not hit:
+        return "LV"
+    kv = float(hit[1]) if hit[0] == "kv" else float(hit[1]) / 1000
 
     if kv <= LV_MAX_KV:
         return "LV"
@@ -157,6 +187,19 @@ def _voltage_class(voltage_rating_str: str) -> str:
         return "HV"
 
 
+@lru_cache(maxsize=256)
+def _keyword_test_codes(testing_requirements_text: str) -> frozenset:
+    """
+    Test codes triggered by keywords in the RFP testing text. Every line item
+    of a tender shares the same text, so the regex scan runs once per tender.
+    """
+    codes: set = set()
+    for pattern, pattern_codes in _COMPILED_TEST_KEYWORDS:
+        if pattern.search(testing_requirements_text):
+            codes.update(pattern_codes)
+    return frozenset(codes)
+
+
 def extract_required_tests(testing_requirements_text: str, voltage_rating: str = "") -> List[str]:
     """
     FIX 3 — Build the test list in two steps:
@@ -179,28 +222,40 @@ def extract_required_tests(testing_requirements_text: str, voltage_rating: str =
 
     # ── Step B: keyword overlay from RFP text ────────────────────────────
     if testing_requirements_text and testing_requirements_text.strip():
-        text = testing_requirements_text.lower()
-        for pattern, codes in TEST_KEYWORD_MAP.items():
-            if re.search(pattern, text):
-                found_codes.update(codes)
+        found_codes.update(_keyword_test_codes(testing_requirements_text))
 
     return sorted(list(found_codes))
 
 
+def index_test_services(test_services_db):
+    """Key the Testing Services sheet by Test_Code once (first row wins on duplicates)."""
+    return test_services_db.drop_duplicates("Test_Code").set_index("Test_Code")
+
+
 def get_test_details(test_codes: List[str], test_services_db) -> List[Dict]:
     """
     Look up test details from the Testing Services sheet.
     Unknown codes get an estimated price with a clear label.
+
+    Accepts the raw sheet or one already keyed by index_test_services().
     """
+    if "Test_Code" in test_services_db.columns:
+        test_services_db = index_test_services(test_services_db)
+
+    found = test_services_db.index.get_indexer(test_codes) >= 0
+    rows  = test_services_db.reindex(test_codes)
+
     results = []
-    for code in test_codes:
-        row = test_services_db[test_services_db["Test_Code"] == code]
-        if not row.empty:
+    for code, known, name, price, duration in zip(
+        test_codes, found,
+        rows["Test_Name"].values, rows["Price_INR"].values, rows["Duration_Hours"].values,
+    ):
+        if known:
             results.append({
                 "test_code":      code,
-                "test_name":      row["Test_Name"].iloc[0],
-                "price_inr":      float(row["Price_INR"].iloc[0]),
-                "duration_hours": float(row["Duration_Hours"].iloc[0]),
+                "test_name":      name,
+                "price_inr":      float(price),
+                "duration_hours": float(duration),
             })
         else:
             results.append({
@@ -216,6 +271,23 @@ def get_test_details(test_codes: List[str], test_services_db) -> List[Dict]:
 # MAIN AGENT
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _index_product_catalog(product_db) -> Dict[str, tuple]:
+    """
+    Build {Product_ID: (unit_price, moq, voltage_rating)} once per run so each
+    line item is a hashed lookup instead of a boolean scan of the catalogue.
+    The first row wins on duplicate IDs, same as the old .iloc[0] lookup.
+    """
+    catalog = product_db.drop_duplicates("Product_ID")
+    return dict(zip(
+        catalog["Product_ID"],
+        zip(
+            catalog["Unit_Price_INR_per_meter"].astype(float).tolist(),
+            catalog["Min_Order_Qty_Meters"].astype(int).tolist(),
+            catalog["Voltage_Rating"].astype(str).tolist(),
+        ),
+    ))
+
+
 def pricing_agent(state: dict) -> dict:
     """
     Pricing Agent — assigns unit prices and test costs per line item.
@@ -226,10 +298,11 @@ def pricing_agent(state: dict) -> dict:
         product_db           — OEM Product Catalog
         volume_discounts_db  — Volume Discounts sheet  (NEW — needed for Fix 2)
         test_services_db     — Testing Services sheet
+        verbose              — optional; False skips the console report
 
     Writes to state:
         consolidated_pricing — full cost breakdown
-        prices               — list of line totals (backward compat)
+        prices               — float64 array of line totals (backward compat)
     """
     pricing_summary      = state.get("pricing_summary", {})
     line_item_matches    = state.get("line_item_matches", [])
@@ -238,8 +311,10 @@ def pricing_agent(state: dict) -> dict:
     volume_discounts_db  = state.get("volume_discounts_db")   # may be None if not loaded
 
     testing_requirements_text = pricing_summary.get("testing_requirements", "")
+    verbose = state.get("verbose", True)
 
-    print(f"\n💰 Pricing Agent: Processing {len(line_item_matches)} line item(s)")
+    if verbose:
+        print(f"\n💰 Pricing Agent: Processing {len(line_item_matches)} line item(s)")
 
     if not line_item_matches:
         state["consolidated_pricing"] = {
@@ -248,16 +323,38 @@ def pricing_agent(state: dict) -> dict:
             "total_test_cost": 0,
             "grand_total": 0,
         }
-        state["prices"] = []
+        state["prices"] = np.empty(0, dtype=np.float64)
         return state
 
+    product_catalog     = _index_product_catalog(product_db)
+    discount_index      = index_volume_discounts(volume_discounts_db)
+    test_index          = index_test_services(test_services_db) if test_services_db is not None else None
+    test_bundles: Dict[tuple, List[Dict]] = {}   # test-code bundle → details
+    report: List[str]   = []                     # buffered per-item console output
     line_item_pricing   = []
     total_material_cost = 0.0
     total_test_cost     = 0.0
 
-    for item_result in line_item_matches:
+    # ── Batch pass: catalogue values + order quantities for every item ───
+    selected_skus = [item.get("selected_sku") for item in line_item_matches]
+    catalogue_rows = [
+        (product_catalog.get(sku["product_id"])
+         or (sku.get("unit_price", 0.0), sku.get("moq", 100), ""))
+        if sku else (0.0, 0, "")
+        for sku in selected_skus
+    ]
+    rfp_qtys = [
+        extract_rfp_quantity(item.get("line_item", "")) if sku else None
+        for item, sku in zip(line_item_matches, selected_skus)
+    ]
+    # FIX 1: Use RFP quantity (not just MOQ) — must order at least MOQ
+    # Per item, so an int MOQ stays an int even when another row's is a float
+    order_qtys = [max(q or 0, row[1]) for q, row in zip(rfp_qtys, catalogue_rows)]
+
+    for item_result, selected_sku, catalog_entry, rfp_qty, order_qty in zip(
+        line_item_matches, selected_skus, catalogue_rows, rfp_qtys, order_qtys
+    ):
         line_item_text = item_result.get("line_item", "")
-        selected_sku   = item_result.get("selected_sku")
 
         if not selected_sku:
             line_item_pricing.append({
@@ -276,24 +373,10 @@ def pricing_agent(state: dict) -> dict:
             continue
 
         product_id = selected_sku["product_id"]
-
-        # ── Catalogue values ──────────────────────────────────────────────
-        product_row = product_db[product_db["Product_ID"] == product_id]
-        if not product_row.empty:
-            catalogue_unit_price = float(product_row["Unit_Price_INR_per_meter"].iloc[0])
-            moq                  = int(product_row["Min_Order_Qty_Meters"].iloc[0])
-            voltage_rating       = str(product_row["Voltage_Rating"].iloc[0])
-        else:
-            catalogue_unit_price = selected_sku.get("unit_price", 0.0)
-            moq                  = selected_sku.get("moq", 100)
-            voltage_rating       = ""
-
-        # ── FIX 1: Use RFP quantity (not just MOQ) ───────────────────────
-        rfp_qty   = extract_rfp_quantity(line_item_text)
-        order_qty = max(rfp_qty or 0, moq)   # must order at least MOQ
+        catalogue_unit_price, moq, voltage_rating = catalog_entry
 
         # ── FIX 2: Volume-discounted unit price ───────────────────────────
-        discounted_price = get_discounted_unit_price(product_id, order_qty, volume_discounts_db)
+        discounted_price = get_discounted_unit_price(product_id, order_qty, discount_index)
         unit_price       = discounted_price if discounted_price is not None else catalogue_unit_price
 
         # Calculate discount % for display
@@ -308,7 +391,11 @@ def pricing_agent(state: dict) -> dict:
         required_test_codes = extract_required_tests(testing_requirements_text, voltage_rating)
 
         if test_services_db is not None:
-            test_details = get_test_details(required_test_codes, test_services_db)
+            # Line items of one tender mostly share a bundle — resolve each once
+            bundle_key = tuple(required_test_codes)
+            if bundle_key not in test_bundles:
+                test_bundles[bundle_key] = get_test_details(required_test_codes, test_index)
+            test_details = list(test_bundles[bundle_key])
         else:
             test_details = [
                 {"test_code": "RT-01",   "test_name": "Routine Insulation Test",        "price_inr": 8_000.0,  "duration_hours": 1.0},
@@ -340,18 +427,26 @@ def pricing_agent(state: dict) -> dict:
         }
         line_item_pricing.append(row)
 
-        print(f"\n   📦 {line_item_text[:60]}")
-        print(f"      SKU           : {product_id}")
-        print(f"      Voltage Class : {_voltage_class(voltage_rating)}")
-        print(f"      RFP Qty       : {rfp_qty or '(not found)'} m")
-        print(f"      MOQ           : {moq} m")
-        print(f"      Order Qty     : {order_qty} m  ← FIX 1: max(rfp_qty, moq)")
-        print(f"      Unit Price    : ₹{unit_price:,.2f}/m"
-              + (f"  (disc {discount_pct}% from ₹{catalogue_unit_price:,.2f})" if discount_pct else ""))
-        print(f"      Material Cost : ₹{material_cost:,.0f}  ← FIX 2: unit_price × order_qty")
-        print(f"      Tests         : {[t['test_code'] for t in test_details]}")
-        print(f"      Test Cost     : ₹{test_cost:,.0f}  ← FIX 3: voltage-class aware")
-        print(f"      Line Total    : ₹{line_total:,.0f}")
+        if verbose:
+            report.append(
+                f"\n   📦 {line_item_text[:60]}\n"
+                f"      SKU           : {product_id}\n"
+                f"      Voltage Class : {row['voltage_class']}\n"
+                f"      RFP Qty       : {rfp_qty or '(not found)'} m\n"
+                f"      MOQ           : {moq} m\n"
+                f"      Order Qty     : {order_qty} m  ← FIX 1: max(rfp_qty, moq)\n"
+                f"      Unit Price    : ₹{unit_price:,.2f}/m"
+                + (f"  (disc {discount_pct}% from ₹{catalogue_unit_price:,.2f})" if discount_pct else "") + "\n"
+                f"      Material Cost : ₹{material_cost:,.0f}  ← FIX 2: unit_price × order_qty\n"
+                f"      Tests         : {[t['test_code'] for t in test_details]}\n"
+                f"      Test Cost     : ₹{test_cost:,.0f}  ← FIX 3: voltage-class aware\n"
+                f"      Line Total    : ₹{line_total:,.0f}\n"
+            )
+
+    # One write for the whole per-item report instead of ~10 prints per item
+    if verbose:
+        sys.stdout.write("".join(report))
+        sys.stdout.flush()
 
     grand_total = round(total_material_cost + total_test_cost, 2)
 
@@ -363,7 +458,7 @@ def pricing_agent(state: dict) -> dict:
     }
 
     state["consolidated_pricing"] = consolidated_pricing
-    state["prices"] = [r["line_total_inr"] for r in line_item_pricing]
+    state["prices"] = np.asarray([r["line_total_inr"] for r in line_item_pricing], dtype=np.float64)
 
     agent_output = {
         "line_item_count": len(line_item_pricing),
@@ -392,22 +487,22 @@ def pricing_agent(state: dict) -> dict:
 
 
     # ── Push to Supabase ──────────────────────────────────────────────────
-    import json as _json
     project_name = state.get("rfps", [{}])[0].get("projectName", "unknown")
     try:
-        push_to_table("pricing_results", {
+        push_to_table_async("pricing_results", {
             "project_name":      project_name,
             "grand_total":       grand_total,
             "total_material_cost": total_material_cost,
             "total_test_cost":   total_test_cost,
-            "full_output":       _json.loads(_json.dumps(agent_output, default=str)),
+            "full_output":       to_json_safe(agent_output),
         })
     except Exception as e:
         print(f"⚠️  Failed to push pricing results to DB: {e}")
 
-    print(f"\n   {'─'*45}")
-    print(f"   Total Material : ₹{total_material_cost:,.0f}")
-    print(f"   Total Tests    : ₹{total_test_cost:,.0f}")
-    print(f"   GRAND TOTAL    : ₹{grand_total:,.0f}")
+    if verbose:
+        print(f"\n   {'─'*45}")
+        print(f"   Total Material : ₹{total_material_cost:,.0f}")
+        print(f"   Total Tests    : ₹{total_test_cost:,.0f}")
+        print(f"   GRAND TOTAL    : ₹{grand_total:,.0f}")
 
     return state
\ No newline at end of file
@@ -11,11 +11,22 @@ Now supports multiple source URLs — scrapes each one independently,
 pools all tenders together, then selects the single most urgent one.
 """
 
+import os
+import json
+import hashlib
+import threading
 import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from services.supabase_client import upsert_to_table, move_expired_tenders
+from services.supabase_client import upsert_to_table, move_expired_tenders, to_json_safe
+
+try:
+    import orjson
+except ImportError:          # optional speed-up; stdlib json is the fallback
+    orjson = None
 
 # ── HTTP session with retry ───────────────────────────────────────────────
 session = requests.Session()
@@ -24,21 +35,36 @@ retries = Retry(
     backoff_factor=2,
     status_forcelist=[500, 502, 503, 504],
 )
-session.mount("https://", HTTPAdapter(max_retries=retries))
+# Every request goes to the single scraper host, so one host pool is enough;
+# its keep-alive connections are reused across sales_agent runs. The pool
+# holds one connection per concurrent prefetch.
+PREFETCH_WORKERS = 4
+_adapter = HTTPAdapter(max_retries=retries, pool_connections=1, pool_maxsize=PREFETCH_WORKERS)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+session.headers["Connection"] = "keep-alive"
 
 SCRAPER_BASE  = "https://ey-fmcg.onrender.com/scrape"
 DEFAULT_URL   = "https://tender-frontend-eight.vercel.app"
 
+# Successful scrapes are kept on disk for the rest of the day, so repeated
+# pipeline runs skip the (slow, cold-starting) scraper API.
+SCRAPER_CACHE_DIR = os.path.join(".cache", "scraper")
+_ensured_dirs = set()   # cache dirs already created by this process
+
 
 def build_scraper_url(tender_site_url: str) -> str:
     """Build the scraper API endpoint for a given tender site URL."""
     return f"{SCRAPER_BASE}?months=3&url={tender_site_url}"
 
 
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%m/%d/%Y")
+
+
 def parse_date(date_str):
     if not date_str:
         return None
-    for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%m/%d/%Y"):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str.replace("Z", ""), fmt)
         except ValueError:
@@ -46,12 +72,71 @@ def parse_date(date_str):
     return None
 
 
-def fetch_tenders_from_url(tender_site_url: str) -> list:
+def parse_dates(date_strs) -> pd.Series:
+    """
+    Vectorized parse_date over a whole list of deadlines.
+    Tries the same formats in the same order; unparseable values become NaT,
+    as do dates outside datetime64[ns] (e.g. a 9999-12-31 placeholder), which
+    can never fall inside the submission window anyway.
+    """
+    raw    = pd.Series(date_strs, dtype="object").str.replace("Z", "", regex=False)
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        hit = pd.to_datetime(raw, format=fmt, errors="coerce")
+        hit = hit.where((hit >= pd.Timestamp.min) & (hit <= pd.Timestamp.max)).dt.as_unit("ns")
+        parsed = parsed.fillna(hit)
+    return parsed
+
+
+def _scrape_cache_path(api_url: str) -> str:
+    return os.path.join(SCRAPER_CACHE_DIR, hashlib.md5(api_url.encode()).hexdigest() + ".json")
+
+
+def _load_cached_tenders(api_url: str):
+    """Return today's cached tenders for api_url, or None on miss/stale/corrupt."""
+    try:
+        with open(_scrape_cache_path(api_url), "rb") as f:
+            raw = f.read()
+        cached = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    if cached.get("date") != datetime.today().date().isoformat():
+        return None
+    return cached.get("tenders")
+
+
+def _store_cached_tenders(api_url: str, tenders: list) -> None:
+    payload = {"date": datetime.today().date().isoformat(), "tenders": tenders}
+    # Encoded up front so the file gets a single write
+    data = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+    try:
+        if SCRAPER_CACHE_DIR not in _ensured_dirs:
+            os.makedirs(SCRAPER_CACHE_DIR, exist_ok=True)
+            _ensured_dirs.add(SCRAPER_CACHE_DIR)
+        with open(_scrape_cache_path(api_url), "wb") as f:
+            f.write(data)
+    except OSError as e:
+        _ensured_dirs.discard(SCRAPER_CACHE_DIR)   # re-check the dir next time
+        print(f"   ⚠️  Could not cache scrape result: {e}")
+
+
+def fetch_tenders_from_url(tender_site_url: str, force_refresh: bool = False) -> list:
     """
     Call the scraper API for a single tender site URL.
     Returns a list of raw tender dicts (or empty list on failure).
+
+    A successful, non-empty response is reused for the rest of the day
+    unless force_refresh is set. Empty results are never cached, so a
+    cold-starting scraper doesn't hide the source until tomorrow.
     """
     api_url = build_scraper_url(tender_site_url)
+
+    if not force_refresh:
+        cached = _load_cached_tenders(api_url)
+        if cached is not None:
+            print(f"   ♻️  Using today's cached scrape for {tender_site_url} ({len(cached)} tender(s))")
+            return cached
+
     print(f"   📡 Scraping: {tender_site_url}")
     try:
         response = session.get(api_url, timeout=120)
@@ -61,12 +146,68 @@ def fetch_tenders_from_url(tender_site_url: str) -> list:
         data = response.json()
         tenders = data.get("data", [])
         print(f"   ✅ Found {len(tenders)} tender(s) from {tender_site_url}")
+        if tenders:
+            _store_cached_tenders(api_url, tenders)
         return tenders
     except Exception as e:
         print(f"   ❌ Failed to scrape {tender_site_url}: {e}")
         return []
 
 
+# RFP field ← scraped section heading
+_SECTION_KEYS = (
+    ("project_overview",         "1. Project Overview"),
+    ("scope_of_supply",          "2. Scope of Supply"),
+    ("technical_specifications", "3. Technical Specifications"),
+    ("testing_requirements",     "4. Acceptance & Test Requirements"),
+    ("delivery_timeline",        "5. Delivery Timeline"),
+    ("pricing_details",          "6. Pricing Details"),
+    ("evaluation_criteria",      "7. Evaluation Criteria"),
+    ("submission_format",        "8. Submission Format"),
+)
+
+
+def _pack_tender(rfp: dict, due_date) -> dict:
+    """Flatten one scraped tender into the RFP dict the pipeline passes around."""
+    sections = rfp.get("sections", {})
+    tender = {
+        "projectName":        rfp.get("project_name"),
+        "issued_by":          rfp.get("issued_by"),
+        "category":           rfp.get("category"),
+        "submissionDeadline": rfp.get("submission_deadline"),
+        "_due_date":          due_date,                     # internal, for sorting
+        "_source_url":        rfp.get("_source_url", ""),   # track origin
+    }
+    tender.update({key: sections.get(heading, "") for key, heading in _SECTION_KEYS})
+    return tender
+
+
+_prefetch_pool = None   # created on first use so forked workers don't inherit it
+_prefetch_lock = threading.Lock()
+
+
+def prefetch_tenders(source_urls, force_refresh: bool = False) -> dict:
+    """
+    Start scraping every URL in the background and return {url: Future}.
+
+    Call this before building/invoking the graph and pass the result in as
+    state['_tender_prefetch']; sales_agent then only waits on the futures, so
+    the slow scraper calls overlap each other and the graph setup.
+    """
+    global _prefetch_pool
+    if _prefetch_pool is None:
+        with _prefetch_lock:    # request threads may get here at once
+            if _prefetch_pool is None:
+                _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS,
+                                                    thread_name_prefix="scraper")
+    if isinstance(source_urls, str):
+        source_urls = [source_urls]
+    return {
+        url: _prefetch_pool.submit(fetch_tenders_from_url, url, force_refresh)
+        for url in dict.fromkeys(source_urls)
+    }
+
+
 def sales_agent(state: dict) -> dict:
     """
     Sales Agent — scrapes one or more tender site URLs, pools all tenders,
@@ -75,6 +216,9 @@ def sales_agent(state: dict) -> dict:
 
     Reads state['source_urls'] (list) if provided by app.py.
     Falls back to the hardcoded DEFAULT_URL if not set.
+    Set state['force_refresh'] to bypass today's cached scrape, and
+    state['_tender_prefetch'] (from prefetch_tenders) to reuse scrapes that
+    were started before the graph ran.
     """
     print("🔍 Sales Agent fetching live scraped tenders...")
 
@@ -88,9 +232,15 @@ def sales_agent(state: dict) -> dict:
     print(f"🌐 Scraping {len(source_urls)} source URL(s)...")
 
     # ── Scrape all URLs and pool results ─────────────────────────────────
+    force_refresh = bool(state.get("force_refresh"))
+    pending       = state.pop("_tender_prefetch", None) or {}
+    missing       = [url for url in source_urls if url not in pending]
+    if missing:
+        pending.update(prefetch_tenders(missing, force_refresh=force_refresh))
+
     all_raw_rfps = []
     for url in source_urls:
-        tenders = fetch_tenders_from_url(url)
+        tenders = pending[url].result()
         # Tag each tender with which source it came from
         for t in tenders:
             t["_source_url"] = url
@@ -112,31 +262,14 @@ def sales_agent(state: dict) -> dict:
     three_months = today + timedelta(days=90)
 
     # ── Filter to tenders due within 3 months ────────────────────────────
-    upcoming = []
-    for rfp in all_raw_rfps:
-        due_date = parse_date(rfp.get("submission_deadline"))
-        if not due_date:
-            continue
-        if not (today <= due_date <= three_months):
-            continue
-
-        sections = rfp.get("sections", {})
-        upcoming.append({
-            "projectName":              rfp.get("project_name"),
-            "issued_by":                rfp.get("issued_by"),
-            "category":                 rfp.get("category"),
-            "submissionDeadline":       rfp.get("submission_deadline"),
-            "_due_date":                due_date,           # internal, for sorting
-            "_source_url":              rfp.get("_source_url", ""),  # track origin
-            "project_overview":         sections.get("1. Project Overview", ""),
-            "scope_of_supply":          sections.get("2. Scope of Supply", ""),
-            "technical_specifications": sections.get("3. Technical Specifications", ""),
-            "testing_requirements":     sections.get("4. Acceptance & Test Requirements", ""),
-            "delivery_timeline":        sections.get("5. Delivery Timeline", ""),
-            "pricing_details":          sections.get("6. Pricing Details", ""),
-            "evaluation_criteria":      sections.get("7. Evaluation Criteria", ""),
-            "submission_format":        sections.get("8. Submission Format", ""),
-        })
+    due_dates = parse_dates([rfp.get("submission_deadline") for rfp in all_raw_rfps])
+    in_window = ((due_dates >= today) & (due_dates <= three_months)).to_numpy()
+
+    upcoming = [
+        _pack_tender(rfp, due_date)
+        for rfp, due_date, keep in zip(all_raw_rfps, due_dates, in_window)
+        if keep
+    ]
 
     if not upcoming:
         print("⚠️  No valid tenders found in the 3-month window across all sources")
@@ -147,16 +280,15 @@ def sales_agent(state: dict) -> dict:
         print(f"   • [{t['_source_url']}] {t['projectName']} — deadline {t['submissionDeadline']}")
 
     # ── Push all valid tenders to Supabase ───────────────────────────────
-    import json as _json
     for t in upcoming:
         tender_row = {
             "project_name":        t["projectName"],
             "issued_by":           t.get("issued_by"),
             "category":            t.get("category"),
             "submission_deadline": t["submissionDeadline"],
-            "tender_data":         _json.loads(_json.dumps({
+            "tender_data":         to_json_safe({
                 k: v for k, v in t.items() if k not in ("_due_date", "_source_url")
-            }, default=str)),
+            }),
         }
         try:
             upsert_to_table("tenders", tender_row)
@@ -21,8 +21,30 @@ Scoring Factors & Weights:
 
 import math
 import re
+import numpy as np
+from dataclasses import dataclass, field
+from itertools import accumulate
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set
+
+from utils.product_store import ProductStore
+from utils.ranking import top_k_indices
+
+
+@dataclass(slots=True)
+class MatchAggregate:
+    """Per-RFP totals over the quick matches, filled by RFPScorer._aggregate_matches."""
+    n_matches:          int   = 0
+    total_products:     int   = 0      # matches found in the catalogue
+    actual_cost:        float = 0.0
+    weighted_lead_time: float = 0.0
+    weight_sum:         float = 0.0
+    bis_count:          int   = 0
+    std_count:          int   = 0
+    warranty_sum:       float = 0
+    high_moq_count:     int   = 0
+    categories:         Set[str] = field(default_factory=set)
 
 
 
@@ -32,71 +54,153 @@ from typing import List, Dict, Any
 # (Full per-line-item matching is done by technical_agent.py)
 # ─────────────────────────────────────────────────────────────
 
-def _quick_match_rfp(rfp: dict, product_db) -> List[Dict]:
+# Spec keywords the quick matcher looks for in the RFP text
+QUICK_MATCH_KEYWORDS = (
+    "copper", "cu ",
+    "aluminium", "aluminum", "al ",
+    "xlpe", "cross linked",
+    "pvc",
+)
+
+# One alternation inside a lookahead: the regex engine tries every keyword at
+# each position in a single left-to-right pass, and the zero-width match lets
+# overlapping keywords all be reported (same hits as repeated `in` checks)
+_KEYWORD_SCAN_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in QUICK_MATCH_KEYWORDS) + "))"
+)
+
+
+_PUNCT_RE   = re.compile(r'[^\w\s]')
+_VOLTAGE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:kv|v\b)')
+
+
+def _scan_keywords(text: str) -> Set[str]:
+    """Set of QUICK_MATCH_KEYWORDS occurring anywhere in text."""
+    return {m.group(1) for m in _KEYWORD_SCAN_RE.finditer(text)}
+
+
+@lru_cache(maxsize=256)
+def _rfp_quick_specs(scope_of_supply: str, technical_specifications: str) -> tuple:
+    """
+    (voltage, want_copper, want_alu, want_xlpe, want_pvc) read from an RFP's
+    text. Memoized on the text, so re-scoring the same tender (retries,
+    repeated runs over the day's scrape) skips the text work.
+    """
+    combined_text = " ".join([scope_of_supply, technical_specifications]).lower()
+    combined_text = _PUNCT_RE.sub(' ', combined_text)
+
+    # Every spec keyword present in the text, found in one scan
+    found = _scan_keywords(combined_text)
+
+    def _has(keywords):
+        return not found.isdisjoint(keywords)
+
+    # Extract voltage
+    vm = _VOLTAGE_RE.search(combined_text)
+    rfp_voltage = vm.group(0).replace(" ", "") if vm else None
+
+    want_copper = _has(["copper", "cu "])
+    want_alu    = not want_copper and _has(["aluminium", "aluminum", "al "])
+    want_xlpe   = _has(["xlpe", "cross linked"])
+    want_pvc    = not want_xlpe and _has(["pvc"])
+    return rfp_voltage, want_copper, want_alu, want_xlpe, want_pvc
+
+
+def _quick_match_rfp(rfp: dict, products) -> List[Dict]:
     """
     Lightweight spec match across the whole RFP text to get candidate products.
     Used only for scoring/ranking tenders — not for the final recommendation.
     Returns a flat list of matched products with spec_match_percent.
+
+    products is a ProductStore (RFPScorer.store), or a raw product DataFrame
+    which is converted on the fly.
     """
-    combined_text = " ".join([
+    if not isinstance(products, ProductStore):
+        products = ProductStore.from_dataframe(products)
+
+    # Which specs the RFP asks for is the same for every product, so the
+    # per-product work reduces to a few column-wise hit arrays.
+    rfp_voltage, want_copper, want_alu, want_xlpe, want_pvc = _rfp_quick_specs(
         str(rfp.get("scope_of_supply", "")),
         str(rfp.get("technical_specifications", "")),
-    ]).lower()
-    combined_text = re.sub(r'[^\w\s]', ' ', combined_text)
+    )
+
+    total = bool(rfp_voltage) + want_copper + want_alu + want_xlpe + want_pvc
+    if total == 0:
+        return []
+
+    hits = np.zeros(len(products), dtype=np.int8)    # at most 5 criteria
+
+    # Each test runs once per distinct (pre-normalized) value, then is
+    # broadcast to the catalogue rows through the factorized codes
+    if rfp_voltage:
+        v_hit = np.array([rfp_voltage in v or v in rfp_voltage
+                          for v in products.voltage_uniques], dtype=bool)
+        hits += v_hit[products.voltage_codes]
+
+    # Conductor
+    if want_copper or want_alu:
+        key   = "copper" if want_copper else "al"
+        c_hit = np.array([key in c for c in products.conductor_uniques], dtype=bool)
+        hits += c_hit[products.conductor_codes]
+
+    # Insulation
+    if want_xlpe or want_pvc:
+        key   = "xlpe" if want_xlpe else "pvc"
+        i_hit = np.array([key in t for t in products.insulation_uniques], dtype=bool)
+        hits += i_hit[products.insulation_codes]
+
+    # Top 10 for scoring purposes — highest match first, ties in catalogue order
+    candidates = np.flatnonzero(hits > 0)
+    order      = candidates[top_k_indices(hits[candidates], 10)]
+
+    pct_for = [round((k / total) * 100, 2) for k in range(total + 1)]
+    ids, cats, bis = products.product_id, products.category, products.bis_certified
+    return [
+        {
+            "product_id":         ids[i],
+            "spec_match_percent": pct_for[hits[i]],
+            "category":           cats[i],
+            "bis_certified":      str(bis[i]),
+        }
+        for i in order
+    ]
 
-    def _has(keywords):
-        return any(k in combined_text for k in keywords)
 
-    # Extract voltage
-    vm = re.search(r'(\d+(?:\.\d+)?)\s*(?:kv|v\b)', combined_text)
-    rfp_voltage = vm.group(0).replace(" ", "") if vm else None
+# ─────────────────────────────────────────────────────────────
+# Technical-match decay weights
+# ─────────────────────────────────────────────────────────────
 
-    matches = []
-    for _, row in product_db.iterrows():
-        score = 0
-        total = 0
-
-        # Voltage
-        if rfp_voltage:
-            total += 1
-            prod_v = re.sub(r'[^\w]', '', str(row["Voltage_Rating"]).lower())
-            if rfp_voltage in prod_v or prod_v in rfp_voltage:
-                score += 1
-
-        # Conductor
-        if _has(["copper", "cu "]):
-            total += 1
-            if "copper" in str(row["Conductor_Material"]).lower():
-                score += 1
-        elif _has(["aluminium", "aluminum", "al "]):
-            total += 1
-            if any(w in str(row["Conductor_Material"]).lower() for w in ["alum", "al"]):
-                score += 1
-
-        # Insulation
-        if _has(["xlpe", "cross linked"]):
-            total += 1
-            if "xlpe" in str(row["Insulation_Type"]).lower():
-                score += 1
-        elif _has(["pvc"]):
-            total += 1
-            if "pvc" in str(row["Insulation_Type"]).lower():
-                score += 1
+# Rank weights exp(-0.3 * i) for the top 5 matches — 1.0, 0.74, 0.55, 0.41,
+# 0.30 — and their running totals (the denominator for n scores)
+_DECAY     = tuple(math.exp(-0.3 * i) for i in range(5))
+_DECAY_SUM = tuple(accumulate(_DECAY))
 
-        if total == 0:
-            continue
 
-        pct = round((score / total) * 100, 2)
-        if pct > 0:
-            matches.append({
-                "product_id":         row["Product_ID"],
-                "spec_match_percent": pct,
-                "category":           row["Category"],
-                "bis_certified":      str(row["BIS_Certified"]),
-            })
+# ─────────────────────────────────────────────────────────────
+# Grade / recommendation bands
+# ─────────────────────────────────────────────────────────────
 
-    matches.sort(key=lambda x: x["spec_match_percent"], reverse=True)
-    return matches[:10]   # top 10 for scoring purposes
+# A final score >= _GRADE_CUTOFFS[i] earns _GRADES[i + 1]
+_GRADE_CUTOFFS = (45, 55, 65, 75, 85)
+_GRADES = (
+    'D (Poor)',
+    'C (Marginal)',
+    'B (Satisfactory)',
+    'B+ (Good)',
+    'A (Very Good)',
+    'A+ (Excellent)',
+)
+
+# Indexed by the first matching band in calculate_final_scores
+_RECOMMENDATIONS = (
+    "STRONGLY RECOMMEND — Proceed with bid preparation",
+    "CONDITIONAL — Technical gaps identified, assess feasibility",
+    "CONDITIONAL — Pricing optimisation needed, review cost structure",
+    "RECOMMEND — Good opportunity with minor optimisation potential",
+    "CAUTION — Significant gaps, evaluate strategic value before proceeding",
+    "DO NOT PURSUE — Poor fit, resources better allocated elsewhere",
+)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -122,153 +226,147 @@ class RFPScorer:
     def __init__(self, product_db):
         self.product_db = product_db
 
+        # Column arrays with all string normalisation done once for this
+        # catalogue; scoring only gathers matched row positions and sums
+        self.store = ProductStore.from_dataframe(product_db)
+
     # ── Factor 1: Technical Match ────────────────────────────────────────
     def score_technical_match(self, matches: List[Dict]) -> float:
         """
         Score how well OEM products match the RFP (0-100).
         Uses exponential decay weighting across top matches.
         """
-        valid = [m for m in matches if m and m.get('spec_match_percent', 0) > 0]
-        if not valid:
+        # One pass: decay-weight the first 5 valid (>0%) matches, count the
+        # good (>=70%) ones among all of them
+        total = 0.0
+        n     = 0
+        good  = 0
+        for m in matches:
+            pct = m.get('spec_match_percent', 0) if m else 0
+            if pct <= 0:
+                continue
+            if n < len(_DECAY):
+                total += pct * _DECAY[n]
+            n += 1
+            if pct >= 70:
+                good += 1
+        if n == 0:
             return 0.0
 
-        total_score  = 0.0
-        total_weight = 0.0
-        for i, m in enumerate(valid[:5]):
-            w = math.exp(-0.3 * i)   # 1.0, 0.74, 0.55, 0.41, 0.30
-            total_score  += m['spec_match_percent'] * w
-            total_weight += w
-
-        avg = total_score / total_weight if total_weight > 0 else 0
+        avg = total / _DECAY_SUM[min(n, len(_DECAY)) - 1]
 
         # Bonus for multiple good matches
-        good = len([m for m in valid if m['spec_match_percent'] >= 70])
         multiplier = min(1.0 + (good - 1) * 0.05, 1.15)
 
         return min(avg * multiplier, 100.0)
 
-    # ── Factor 2: Price Competitiveness ──────────────────────────────────
-    def score_price_competitiveness(self, estimated_price: float, matches: List[Dict]) -> float:
+    # ── One pass over matches for every catalogue-backed factor ──────────
+    def _aggregate_matches(self, matches: List[Dict]) -> "MatchAggregate":
         """
-        Score pricing quality vs ideal margin benchmark (0-100).
+        Walk matches once to collect catalogue positions, then reduce the
+        precomputed per-row arrays into what the price, delivery, compliance
+        and risk factors need.
         """
-        if estimated_price <= 0 or not matches:
-            return 0.0
-
-        actual_cost = 0.0
+        store  = self.store
+        row_of = store.pid_to_idx
+        agg    = MatchAggregate(n_matches=len(matches))
+        found  = []     # catalogue positions of matched products
+        pcts   = []     # their spec_match_percent, same order
         for m in matches:
             if not m:
                 continue
-            row = self.product_db[self.product_db['Product_ID'] == m.get('product_id')]
-            if not row.empty:
-                actual_cost += (row['Unit_Price_INR_per_meter'].iloc[0] *
-                                row['Min_Order_Qty_Meters'].iloc[0])
+            agg.categories.add(m.get('category', 'Unknown'))
 
-        if actual_cost <= 0:
-            actual_cost = estimated_price * 0.70
+            pos = row_of.get(m.get('product_id'))
+            if pos is None:
+                continue
+            found.append(pos)
+            pcts.append(m.get('spec_match_percent', 0))
+
+        if found:
+            # sum() over lists adds left to right, exactly like the old loop
+            agg.total_products     = len(found)
+            agg.actual_cost        = sum(store.unit_cost[found].tolist())
+            agg.weighted_lead_time = sum((store.lead_time[found] * np.asarray(pcts)).tolist())
+            agg.weight_sum         = sum(pcts)
+            agg.high_moq_count     = int(store.high_moq[found].sum())
+            agg.bis_count          = int(store.bis_yes[found].sum())
+            agg.std_count          = int(store.std_hit[found].sum())
+            agg.warranty_sum       = store.warranty_capped[found].sum().item()
+        return agg
+
+    # ── Factor 2: Price Competitiveness ──────────────────────────────────
+    def score_price_competitiveness(self, estimated_price: float, agg: "MatchAggregate") -> float:
+        """
+        Score pricing quality vs ideal margin benchmark (0-100).
+        """
+        return float(self.score_price_competitiveness_batch([estimated_price], [agg])[0])
 
-        margin = (estimated_price - actual_cost) / estimated_price if estimated_price > 0 else 0
-        deviation = abs(margin - self.IDEAL_MARGIN)
+    def score_price_competitiveness_batch(self, estimated_prices, aggs: List["MatchAggregate"]) -> np.ndarray:
+        """
+        score_price_competitiveness for many RFPs at once — one sigmoid over
+        the array of margin deviations instead of a math.exp per RFP.
+        """
+        est  = np.asarray(estimated_prices, dtype=np.float64)
+        cost = np.array([a.actual_cost for a in aggs], dtype=np.float64)
+        scorable = (est > 0) & np.array([a.n_matches > 0 for a in aggs], dtype=bool)
 
-        score = 100 / (1 + math.exp(10 * (deviation - 0.10)))
-        if margin < 0.05:
-            score *= 0.5
-        elif margin > 0.50:
-            score *= 0.6
+        cost = np.where(cost > 0, cost, est * 0.70)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            margin    = np.where(est > 0, (est - cost) / est, 0.0)
+            deviation = np.abs(margin - self.IDEAL_MARGIN)
+            score     = 100 / (1 + np.exp(10 * (deviation - 0.10)))
 
-        return max(0.0, min(score, 100.0))
+        score *= np.where(margin < 0.05, 0.5, np.where(margin > 0.50, 0.6, 1.0))
+        return np.where(scorable, np.clip(score, 0.0, 100.0), 0.0)
 
     # ── Factor 3: Delivery Capability ────────────────────────────────────
-    def score_delivery_capability(self, matches: List[Dict], deadline: str = None) -> float:
+    def score_delivery_capability(self, agg: "MatchAggregate", days_until_deadline: Optional[int] = None) -> float:
         """
         Score deliverability based on lead times vs deadline (0-100).
+        days_until_deadline comes from days_until() — None if unknown.
         """
-        if not matches:
+        if not agg.n_matches:
             return 0.0
 
-        total_lt = 0
-        total_w  = 0
-        for m in matches:
-            if not m:
-                continue
-            row = self.product_db[self.product_db['Product_ID'] == m.get('product_id')]
-            if not row.empty:
-                lt = row['Lead_Time_Days'].iloc[0]
-                pct = m.get('spec_match_percent', 0)
-                total_lt += lt * pct
-                total_w  += pct
-
-        avg_lt = total_lt / total_w if total_w > 0 else 30
+        avg_lt = agg.weighted_lead_time / agg.weight_sum if agg.weight_sum > 0 else 30
         base   = max(40, 100 - (avg_lt - 15) * 0.8)
 
-        if deadline:
-            try:
-                dl   = datetime.fromisoformat(deadline.replace('Z', ''))
-                days = (dl - datetime.now()).days
-                if avg_lt > days * 0.7:
-                    base *= 0.7
-            except Exception:
-                pass
+        if days_until_deadline is not None and avg_lt > days_until_deadline * 0.7:
+            base *= 0.7
 
         return max(0.0, min(base, 100.0))
 
     # ── Factor 4: Compliance ─────────────────────────────────────────────
-    def score_compliance(self, matches: List[Dict]) -> float:
+    def score_compliance(self, agg: "MatchAggregate") -> float:
         """
         Score BIS certification + standards compliance + warranty (0-100).
         """
-        if not matches:
+        if not agg.n_matches:
             return 0.0
 
-        bis = standards = 0
-        warranty_sum = 0
-        total = 0
-
-        for m in matches:
-            if not m:
-                continue
-            row = self.product_db[self.product_db['Product_ID'] == m.get('product_id')]
-            if row.empty:
-                continue
-            total += 1
-            if row['BIS_Certified'].iloc[0].lower() == 'yes':
-                bis += 1
-            stds = str(row['Standards_Compliance'].iloc[0]).lower()
-            if any(s in stds for s in ['is', 'iec', 'ieee', 'iso']):
-                standards += 1
-            warranty_sum += min(row['Warranty_Years'].iloc[0], 5)
-
+        total = agg.total_products
         if total == 0:
             return 0.0
 
         return min(
-            (bis / total) * 40 +
-            (standards / total) * 40 +
-            (warranty_sum / total / 5) * 20,
+            (agg.bis_count / total) * 40 +
+            (agg.std_count / total) * 40 +
+            (agg.warranty_sum / total / 5) * 20,
             100.0
         )
 
     # ── Factor 5: Risk Assessment ─────────────────────────────────────────
-    def score_risk_assessment(self, matches: List[Dict], estimated_price: float) -> float:
+    def score_risk_assessment(self, agg: "MatchAggregate") -> float:
         """
         Score risk — availability, diversity, MOQ (0-100, higher = lower risk).
         """
-        if not matches:
+        if not agg.n_matches:
             return 0.0
 
-        availability = min(len(matches) * 20, 50)
-        categories   = {m.get('category', 'Unknown') for m in matches if m}
-        diversity    = min(len(categories) * 15, 30)
-
-        high_moq = 0
-        for m in matches:
-            if not m:
-                continue
-            row = self.product_db[self.product_db['Product_ID'] == m.get('product_id')]
-            if not row.empty and row['Min_Order_Qty_Meters'].iloc[0] > 500:
-                high_moq += 1
-
-        consistency = max(20 - high_moq * 5, 0)
+        availability = min(agg.n_matches * 20, 50)
+        diversity    = min(len(agg.categories) * 15, 30)
+        consistency  = max(20 - agg.high_moq_count * 5, 0)
         return min(availability + diversity + consistency, 100.0)
 
     # ── Final score ───────────────────────────────────────────────────────
@@ -276,7 +374,7 @@ class RFPScorer:
         self,
         matches: List[Dict],
         estimated_price: float,
-        rfp_deadline: str = None,
+        days_until_deadline: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Calculate weighted final score with full breakdown.
@@ -288,41 +386,55 @@ class RFPScorer:
             component_scores    — per-factor breakdown
             recommendation      — human-readable action
         """
-        tech     = self.score_technical_match(matches)
-        price    = self.score_price_competitiveness(estimated_price, matches)
-        delivery = self.score_delivery_capability(matches, rfp_deadline)
-        comply   = self.score_compliance(matches)
-        risk     = self.score_risk_assessment(matches, estimated_price)
+        return self.calculate_final_scores([matches], [estimated_price], [days_until_deadline])[0]
 
+    def calculate_final_scores(
+        self,
+        matches_list: List[List[Dict]],
+        estimated_prices: List[float],
+        days_until_deadlines: List[Optional[int]],
+    ) -> List[Dict[str, Any]]:
+        """
+        calculate_final_score for several RFPs at once (same order in and out).
+        Factor scores are gathered per RFP, then the weighted total, grade and
+        recommendation are computed for the whole batch as arrays.
+        """
+        aggs     = [self._aggregate_matches(m) for m in matches_list]
+        tech     = [self.score_technical_match(m) for m in matches_list]
+        price    = self.score_price_competitiveness_batch(estimated_prices, aggs).tolist()
+        delivery = [self.score_delivery_capability(a, d) for a, d in zip(aggs, days_until_deadlines)]
+        comply   = [self.score_compliance(a) for a in aggs]
+        risk     = [self.score_risk_assessment(a) for a in aggs]
+
+        w = self.WEIGHTS
+        tech_arr, price_arr = np.asarray(tech, dtype=np.float64), np.asarray(price, dtype=np.float64)
         final = (
-            tech     * self.WEIGHTS['technical_match'] +
-            price    * self.WEIGHTS['price_competitiveness'] +
-            delivery * self.WEIGHTS['delivery_capability'] +
-            comply   * self.WEIGHTS['compliance'] +
-            risk     * self.WEIGHTS['risk_score']
+            tech_arr                                   * w['technical_match'] +
+            price_arr                                  * w['price_competitiveness'] +
+            np.asarray(delivery, dtype=np.float64)     * w['delivery_capability'] +
+            np.asarray(comply, dtype=np.float64)       * w['compliance'] +
+            np.asarray(risk, dtype=np.float64)         * w['risk_score']
+        )
+
+        # NaN sorts past every cutoff; grade it 'D' as the comparison chain did
+        grades = np.where(np.isnan(final), 0, np.searchsorted(_GRADE_CUTOFFS, final, side='right'))
+        recs   = np.select(
+            [final >= 75,
+             (final >= 60) & (tech_arr < 60),
+             (final >= 60) & (price_arr < 60),
+             final >= 60,
+             final >= 45],
+            range(5), default=5,
         )
 
-        if   final >= 85: grade = 'A+ (Excellent)'
-        elif final >= 75: grade = 'A (Very Good)'
-        elif final >= 65: grade = 'B+ (Good)'
-        elif final >= 55: grade = 'B (Satisfactory)'
-        elif final >= 45: grade = 'C (Marginal)'
-        else:             grade = 'D (Poor)'
-
-        if final >= 75:
-            rec = "STRONGLY RECOMMEND — Proceed with bid preparation"
-        elif final >= 60:
-            if tech < 60:
-                rec = "CONDITIONAL — Technical gaps identified, assess feasibility"
-            elif price < 60:
-                rec = "CONDITIONAL — Pricing optimisation needed, review cost structure"
-            else:
-                rec = "RECOMMEND — Good opportunity with minor optimisation potential"
-        elif final >= 45:
-            rec = "CAUTION — Significant gaps, evaluate strategic value before proceeding"
-        else:
-            rec = "DO NOT PURSUE — Poor fit, resources better allocated elsewhere"
+        return [
+            self._score_breakdown(f, _GRADES[g], _RECOMMENDATIONS[r], t, p, d, c, k)
+            for f, g, r, t, p, d, c, k in zip(final.tolist(), grades.tolist(), recs.tolist(),
+                                              tech, price, delivery, comply, risk)
+        ]
 
+    def _score_breakdown(self, final, grade, rec, tech, price, delivery, comply, risk) -> Dict[str, Any]:
+        """Result dict for one RFP from its final score, labels and factor scores."""
         return {
             'final_score':      round(final, 2),
             'grade':            grade,
@@ -349,10 +461,26 @@ class RFPScorer:
 # Convenience function — called by master_agent_start
 # ─────────────────────────────────────────────────────────────
 
-def score_single_rfp(scorer: RFPScorer, rfp: dict, product_db) -> Dict:
+def days_until(deadline, now: datetime) -> Optional[int]:
+    """Whole days from now to an ISO deadline string, or None if missing/unparseable."""
+    if not deadline:
+        return None
+    try:
+        return (datetime.fromisoformat(deadline.replace('Z', '')) - now).days
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _estimate_price(scorer: RFPScorer, matches: List[Dict]) -> float:
+    """Rough bid value: catalogue price × MOQ over the matched products, +25% margin."""
+    rows = scorer.store.rows(m['product_id'] for m in matches)
+    return sum(scorer.store.unit_cost[rows].tolist()) * 1.25   # add 25% margin estimate
+
+
+def score_single_rfp(scorer: RFPScorer, rfp: dict, product_db, now: datetime = None) -> Dict:
     """
     Score one RFP for bid viability.
-    Called by master_agent_start for each shortlisted tender.
+    Called by master_agent_start when only one tender is shortlisted.
 
     Steps:
       1. Quick-match the RFP text against the product DB
@@ -361,16 +489,20 @@ def score_single_rfp(scorer: RFPScorer, rfp: dict, product_db) -> Dict:
 
     Returns the score result dict from calculate_final_score().
     """
-    matches        = _quick_match_rfp(rfp, product_db)
-    estimated_price = sum(
-        product_db[product_db['Product_ID'] == m['product_id']]['Unit_Price_INR_per_meter'].iloc[0] *
-        product_db[product_db['Product_ID'] == m['product_id']]['Min_Order_Qty_Meters'].iloc[0]
-        for m in matches
-        if not product_db[product_db['Product_ID'] == m['product_id']].empty
-    ) * 1.25   # add 25% margin estimate
-
-    return scorer.calculate_final_score(
-        matches=matches,
-        estimated_price=estimated_price,
-        rfp_deadline=rfp.get("submissionDeadline"),
-    )
\ No newline at end of file
+    return score_rfps(scorer, [rfp], now)[0]
+
+
+def score_rfps(scorer: RFPScorer, rfps: List[dict], now: datetime = None) -> List[Dict]:
+    """
+    Score a whole shortlist; results are aligned with rfps.
+    Quick matching runs per RFP, then the factor maths is batched across all
+    RFPs. Every deadline is measured from the same `now`.
+    """
+    now = now or datetime.now()
+    matches_list = [_quick_match_rfp(rfp, scorer.store) for rfp in rfps]
+
+    return scorer.calculate_final_scores(
+        matches_list,
+        [_estimate_price(scorer, matches) for matches in matches_list],
+        [days_until(rfp.get("submissionDeadline"), now) for rfp in rfps],
+    )
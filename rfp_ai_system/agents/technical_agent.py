@@ -13,9 +13,21 @@ PS Requirements:
     and Pricing Agent (via state)
 """
 
+import hashlib
+import os
 import re
+import sys
+import tempfile
+from functools import lru_cache
 from typing import List, Dict, Optional
-from services.supabase_client import push_to_table
+
+import numpy as np
+import pandas as pd
+
+from services.supabase_client import push_to_table_async, to_json_safe
+from utils.loader import load_oem
+from utils.product_store import ProductStore
+from utils.ranking import top_k_indices
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -64,6 +76,15 @@ _INLINE_SPLIT_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Numbered / bulleted list markers at the start of a line, and the plain
+# delimiters used by the other split strategies
+_STRUCTURED_RE = re.compile(
+    r'(?:^|\n)\s*(?:\(\d+\)\s+|\d+[\.\)]\s+|[a-zA-Z][\.\)]\s+|[•\-\*]\s+)',
+    re.MULTILINE,
+)
+_SEMICOLON_RE = re.compile(r';\s*')
+_NEWLINES_RE  = re.compile(r'\n+')
+
 
 def parse_scope_into_line_items(scope_text: str) -> List[str]:
     """
@@ -76,23 +97,22 @@ def parse_scope_into_line_items(scope_text: str) -> List[str]:
     text = scope_text.strip()
 
     # Strategy 1: Numbered / bulleted list
-    structured = r'(?:^|\n)\s*(?:\(\d+\)\s+|\d+[\.\)]\s+|[a-zA-Z][\.\)]\s+|[•\-\*]\s+)'
-    if re.search(structured, text, re.MULTILINE):
-        parts = re.split(structured, text, flags=re.MULTILINE)
+    if _STRUCTURED_RE.search(text):
+        parts = _STRUCTURED_RE.split(text)
         items = [p.strip() for p in parts if p.strip() and len(p.strip()) >= 10]
         if len(items) > 1:
             return items
 
     # Strategy 2: Semicolon-delimited (>= 2 semicolons)
     if text.count(';') >= 2:
-        parts = re.split(r';\s*', text)
+        parts = _SEMICOLON_RE.split(text)
         items = [p.strip() for p in parts if p.strip() and len(p.strip()) >= 10]
         if len(items) > 1:
             return items
 
     # Strategy 3: Newline-separated
     if '\n' in text:
-        parts = re.split(r'\n+', text)
+        parts = _NEWLINES_RE.split(text)
         items = [p.strip() for p in parts if p.strip() and len(p.strip()) >= 10]
         if len(items) > 1:
             return items
@@ -111,6 +131,17 @@ def parse_scope_into_line_items(scope_text: str) -> List[str]:
 # SECTION 2 — RFP spec extractor (expanded)
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Compiled once; extract_rfp_specs runs for every line item
+_VOLTAGE_RE = re.compile(r'\b(\d+(?:\.\d+)?)\s*(?:kv|v)\b')
+_CORES_RE   = re.compile(r'(\d+)\s*(?:core|cores|\bc\b)')
+_SIZE_RE    = re.compile(r'(?:conductor\s*size\s*[:\-]?\s*)?(\d+(?:\.\d+)?)\s*(?:mm[²2]|sq\.?\s*mm)')
+_TEMP_RE    = re.compile(r'\b(\d{2,3})\s*(?:°|deg)\s*c\b')   # needs the ° / "deg" token
+
+# Standards recognised in line items, in reporting order
+STANDARDS = ("is 1554", "is 7098", "iec 60502", "iec 60228", "is 694", "iec 60227")
+# (body, number) pairs; pairs not listed in STANDARDS are ignored
+_STANDARDS_RE = re.compile(r'\b(is|iec)\s*(1554|7098|60502|60228|694|60227)\b')
+
 def extract_rfp_specs(line_item_text: str) -> Dict[str, Optional[str]]:
     """
     Extract ALL measurable spec parameters from a line item description.
@@ -122,12 +153,20 @@ def extract_rfp_specs(line_item_text: str) -> Dict[str, Optional[str]]:
 
     All extracted specs participate equally in Spec Match scoring.
     Unextracted specs (None) are excluded from the denominator.
+
+    Results are memoized by line-item text; each call returns a fresh dict.
     """
+    return dict(_extract_rfp_specs_cached(line_item_text))
+
+
+@lru_cache(maxsize=4096)
+def _extract_rfp_specs_cached(line_item_text: str) -> tuple:
+    # Immutable (key, value) pairs so cached results can't be mutated by callers
     text = line_item_text.lower()
     specs: Dict[str, Optional[str]] = {}
 
     # Voltage rating — e.g. "0.6 kV", "1.1kV", "11 kV", "415V"
-    v = re.search(r'(\d+(?:\.\d+)?)\s*(?:kv|v\b)', text)
+    v = _VOLTAGE_RE.search(text)
     specs["voltage"] = v.group(0).strip() if v else None
 
     # Conductor material
@@ -150,7 +189,7 @@ def extract_rfp_specs(line_item_text: str) -> Dict[str, Optional[str]]:
         specs["insulation_type"] = None
 
     # Number of cores
-    c = re.search(r'(\d+)\s*(?:core|cores|\bc\b)', text)
+    c = _CORES_RE.search(text)
     specs["cores"] = c.group(1) if c else None
 
     # Armoring
@@ -163,28 +202,20 @@ def extract_rfp_specs(line_item_text: str) -> Dict[str, Optional[str]]:
 
     # Conductor size in mm²
     # Matches "185 mm²", "185mm2", "185 sq mm", "conductor size: 185"
-    cs = re.search(
-        r'(?:conductor\s*size\s*[:\-]?\s*)?(\d+(?:\.\d+)?)\s*(?:mm[²2]|sq\.?\s*mm)',
-        text
-    )
+    cs = _SIZE_RE.search(text)
     specs["conductor_size_mm2"] = cs.group(1) if cs else None
 
-    # Temperature rating in °C
-    tr = re.search(r'(\d+)\s*°?\s*c\b', text)
-    # Filter out voltages accidentally caught (e.g. "0.6 kV" → skip)
-    if tr and int(tr.group(1)) >= 50:   # realistic temp range: 50–120 °C
-        specs["temperature_rating_c"] = tr.group(1)
-    else:
-        specs["temperature_rating_c"] = None
+    # Temperature rating in °C — "90°C", "90 ° C", "90 deg C"
+    tr = _TEMP_RE.search(text)
+    specs["temperature_rating_c"] = tr.group(1) if tr else None
 
-    # Standards
-    found_stds = []
-    for std in ["is 1554", "is 7098", "iec 60502", "iec 60228", "is 694", "iec 60227"]:
-        if std in text:
-            found_stds.append(std.upper())
-    specs["standards"] = ", ".join(found_stds) if found_stds else None
+    # Standards — one scan; "IS1554" / "is  1554" count as "IS 1554"
+    found_stds = {f"{body} {num}" for body, num in _STANDARDS_RE.findall(text)}
+    specs["standards"] = ", ".join(
+        std.upper() for std in STANDARDS if std in found_stds
+    ) or None
 
-    return specs
+    return tuple(specs.items())
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -231,43 +262,59 @@ INSULATION_SYNONYMS = {
 }
 
 
-def _norm(val) -> str:
-    if val is None:
-        return ""
-    return re.sub(r'[^\w\s]', ' ', str(val).lower()).strip()
+def _synonym_index(synonyms: Dict[str, List[str]]) -> Dict[str, tuple]:
+    """
+    Reverse index: every canonical name or variant → the terms to look for
+    in a product value (its group's variants plus the canonical name).
+    The first group listing a term wins, as in a dict-order scan.
+    """
+    index = {}
+    for canonical, variants in synonyms.items():
+        terms = (*variants, canonical)
+        for key in terms:
+            index.setdefault(key, terms)
+    return index
 
 
-def _match_spec(spec_key: str, rfp_val: str, product_row) -> bool:
-    """Return True if the product satisfies the given RFP spec."""
-    col = SPEC_TO_DB_COL.get(spec_key)
-    if col is None:
-        return False
+_MATERIAL_TERMS   = _synonym_index(MATERIAL_SYNONYMS)
+_INSULATION_TERMS = _synonym_index(INSULATION_SYNONYMS)
 
-    # Some columns may not exist in the DB — treat as no match
-    if col not in product_row.index:
-        return False
 
-    prod_val = str(product_row[col])
-    if prod_val in ("nan", "", "None"):
-        return False
+_NORM_RE = re.compile(r'[^\w\s]')
+_NUM_RE  = re.compile(r'\d+(?:\.\d+)?')
 
-    p = _norm(prod_val)
-    r = _norm(rfp_val)
+# str() of an empty product cell
+_MISSING = ("nan", "", "None")
 
+
+@lru_cache(maxsize=4096)
+def _norm_text(text: str) -> str:
+    # Product column values repeat across every line item and RFP, so most
+    # calls are cache hits
+    return _NORM_RE.sub(' ', text.lower()).strip()
+
+
+def _norm(val) -> str:
+    if val is None:
+        return ""
+    return _norm_text(str(val))
+
+
+def _match_spec_norm(spec_key: str, rfp_val: str, r: str, prod_val: str, p: str) -> bool:
+    """
+    Return True if a present product value satisfies the given RFP spec;
+    r and p are the _norm() forms of rfp_val and prod_val.
+    """
     if spec_key == "voltage":
         return r.replace(" ", "") in p.replace(" ", "") or p.replace(" ", "") in r.replace(" ", "")
 
     if spec_key == "conductor_material":
-        for canonical, variants in MATERIAL_SYNONYMS.items():
-            if rfp_val in variants or rfp_val == canonical:
-                return any(v in p for v in variants) or canonical in p
-        return r in p
+        terms = _MATERIAL_TERMS.get(rfp_val)
+        return any(t in p for t in terms) if terms else r in p
 
     if spec_key == "insulation_type":
-        for canonical, variants in INSULATION_SYNONYMS.items():
-            if rfp_val in variants or rfp_val == canonical:
-                return any(v in p for v in variants) or canonical in p
-        return r in p
+        terms = _INSULATION_TERMS.get(rfp_val)
+        return any(t in p for t in terms) if terms else r in p
 
     if spec_key == "cores":
         return r in p
@@ -289,7 +336,7 @@ def _match_spec(spec_key: str, rfp_val: str, product_row) -> bool:
         # and pushes correct-size products to the top of the ranking.
         try:
             rfp_size  = float(rfp_val)
-            prod_size = float(re.search(r'\d+(?:\.\d+)?', prod_val).group())
+            prod_size = float(_NUM_RE.search(prod_val).group())
             return prod_size == rfp_size
         except Exception:
             return r in p
@@ -297,7 +344,7 @@ def _match_spec(spec_key: str, rfp_val: str, product_row) -> bool:
     if spec_key == "temperature_rating_c":
         try:
             rfp_temp  = float(rfp_val)
-            prod_temp = float(re.search(r'\d+(?:\.\d+)?', prod_val).group())
+            prod_temp = float(_NUM_RE.search(prod_val).group())
             return prod_temp >= rfp_temp
         except Exception:
             return r in p
@@ -312,88 +359,269 @@ def _match_spec(spec_key: str, rfp_val: str, product_row) -> bool:
     return r in p
 
 
-def compute_spec_match(rfp_specs: Dict, product_row) -> tuple:
+def prepare_spec_plan(rfp_specs: Dict) -> tuple:
     """
-    FIX 2 — Weighted spec match.
+    The specs a line item actually specifies, as (spec_key, rfp_val, weight,
+    db_col) tuples in SPEC_TO_DB_COL order, plus their total weight.
+    Built once per line item and reused for every product.
 
+    FIX 2 — Weighted spec match:
     Score = sum(weight_i × hit_i) / sum(weight_i for specified specs) × 100
 
     conductor_size_mm2 carries 3× weight (see SPEC_WEIGHTS) because selecting
-    the wrong cross-section is a hard safety/cost failure. All other specs
-    carry weight = 1.
+    the wrong cross-section is a hard safety/cost failure. Specs not specified
+    by the RFP are excluded from both numerator and denominator so they don't
+    dilute or inflate the score.
+    """
+    plan = [
+        (spec_key, rfp_specs[spec_key], SPEC_WEIGHTS.get(spec_key, 1), db_col)
+        for spec_key, db_col in SPEC_TO_DB_COL.items()
+        if rfp_specs.get(spec_key) is not None
+    ]
+    return plan, sum(weight for _, _, weight, _ in plan)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SECTION 4 — Line-item matcher
+# ─────────────────────────────────────────────────────────────────────────────
 
-    Specs not specified by the RFP are excluded from both numerator and
-    denominator so they don't dilute or inflate the score.
+# Parsed catalogue columns, saved as .npz per source-file hash so repeat runs
+# skip the Excel parse (by far the slowest part of start-up); the
+# ProductStore is rebuilt from them in a few ms. Loaded with
+# allow_pickle=False, so nothing in the cache directory is ever unpickled.
+# Bump the version whenever the file layout changes.
+INDEX_CACHE_DIR     = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   ".cache", "product_index")
+INDEX_CACHE_VERSION = 4
+
+# npz key prefix for a text column's missing-value mask
+_NA_KEY = "__na__"
+
+
+def _save_catalog(product_db: pd.DataFrame, cache_path: str) -> None:
+    """Write product_db's columns to cache_path as plain numpy arrays."""
+    arrays = {}
+    for col in product_db.columns:
+        values = product_db[col]
+        if values.dtype.kind in "biuf":
+            arrays[col] = values.to_numpy()
+        elif pd.api.types.is_string_dtype(values):
+            arrays[col]           = values.fillna("").to_numpy(dtype=str)
+            arrays[_NA_KEY + col] = values.isna().to_numpy()
+        else:
+            raise TypeError(f"column {col!r} has unsupported dtype {values.dtype}")
+
+    # Write to a temp file and rename, so another worker never reads a
+    # half-written cache
+    fd, tmp_path = tempfile.mkstemp(dir=INDEX_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _load_catalog(cache_path: str) -> pd.DataFrame:
+    with np.load(cache_path, allow_pickle=False) as npz:
+        columns = {}
+        for key in npz.files:
+            if key.startswith(_NA_KEY):
+                continue
+            values = npz[key]
+            if values.dtype.kind == "U":
+                values = pd.Series(values, dtype="str").mask(npz[_NA_KEY + key])
+            columns[key] = values
+    return pd.DataFrame(columns)
+
+
+def _remove_stale_caches(keep: str) -> None:
+    # One catalogue is loaded per app, so any other cache file is a
+    # superseded sheet or layout version
+    for name in os.listdir(INDEX_CACHE_DIR):
+        if name != keep and not name.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(INDEX_CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+def load_product_catalog(path: str) -> tuple:
+    """
+    Load the OEM Product Catalog sheet and build its ProductStore.
+    Returns (product_db, product_index), reusing the on-disk copy of the
+    parsed sheet when the source file's bytes are unchanged.
     """
-    weighted_matched = 0.0
-    total_weight     = 0.0
-    component        = {}
+    with open(path, "rb") as f:
+        digest = hashlib.md5(f.read()).hexdigest()
+    cache_name = f"{digest}.v{INDEX_CACHE_VERSION}.npz"
+    cache_path = os.path.join(INDEX_CACHE_DIR, cache_name)
 
-    for spec_key in SPEC_TO_DB_COL:
-        rfp_val = rfp_specs.get(spec_key)
-        if rfp_val is None:
-            component[spec_key] = "N/A (not specified)"
-            continue
+    product_db = None
+    try:
+        product_db = _load_catalog(cache_path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Corrupt or foreign file — drop it and rebuild from the sheet
+        print(f"⚠️  Discarding unreadable product index cache: {e!r}")
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
 
-        weight       = SPEC_WEIGHTS.get(spec_key, 1)
-        total_weight += weight
+    if product_db is None:
+        product_db = load_oem(path)
+        try:
+            os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+            _save_catalog(product_db, cache_path)
+            _remove_stale_caches(keep=cache_name)
+        except (OSError, TypeError) as e:
+            print(f"⚠️  Could not cache product index: {e}")
 
-        hit = _match_spec(spec_key, rfp_val, product_row)
-        component[spec_key] = "Match" if hit else "No Match"
-        if hit:
-            weighted_matched += weight
+    return product_db, ProductStore.from_dataframe(product_db)
 
-    if total_weight == 0:
-        return 0.0, component
 
-    return round((weighted_matched / total_weight) * 100, 2), component
+# Specs compared numerically: product value's leading number vs the RFP's
+_NUMERIC_SPECS = ("conductor_size_mm2", "temperature_rating_c")
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# SECTION 4 — Line-item matcher
-# ─────────────────────────────────────────────────────────────────────────────
+def _leading_number(text: str) -> float:
+    m = _NUM_RE.search(text)
+    return float(m.group()) if m else np.nan
+
+
+def _to_float(val) -> Optional[float]:
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=64)
+def _spec_value_view(values: tuple) -> tuple:
+    """
+    Per distinct product value of one spec column: _norm(value) (None if
+    missing), the same with spaces removed, and its leading number (NaN if
+    none). The catalogue's columns are the same on every call, so this is
+    computed once per column.
+    """
+    normalized = tuple(None if v in _MISSING else _norm(v) for v in values)
+    compact    = tuple(None if n is None else n.replace(" ", "") for n in normalized)
+    numbers    = np.array([_leading_number(v) for v in values], dtype=np.float64)
+    return normalized, compact, numbers
+
+
+def _spec_hits(store: ProductStore, spec_key: str, rfp_val: str, r: str) -> np.ndarray:
+    """
+    _match_spec_norm for every product row at once (one test per distinct
+    value); a missing product value never matches.
+    r is _norm(rfp_val), computed once per line item by the caller.
+    """
+    col = SPEC_TO_DB_COL[spec_key]
+    if col not in store.text_codes:     # column missing from the DB — no match
+        return np.zeros(len(store), dtype=bool)
+    codes, values = store.text_codes[col], store.text_values[col]
+    normalized, compact, numbers = _spec_value_view(values)
+
+    if spec_key == "voltage":
+        rc = r.replace(" ", "")
+        per_value = [p is not None and (rc in p or p in rc) for p in compact]
+        return np.asarray(per_value, dtype=bool)[codes]
+
+    def scalar(j):
+        p = normalized[j]
+        return p is not None and _match_spec_norm(spec_key, rfp_val, r, values[j], p)
+
+    rfp_num = _to_float(rfp_val) if spec_key in _NUMERIC_SPECS else None
+    if rfp_num is None:
+        per_value = [scalar(j) for j in range(len(values))]
+    else:
+        # _match_spec_norm's numeric rule as one array compare; values with no
+        # number (including missing ones) take the scalar fallback
+        if spec_key == "conductor_size_mm2":
+            per_value = numbers == rfp_num
+        else:
+            per_value = numbers >= rfp_num
+        for j in np.flatnonzero(np.isnan(numbers)).tolist():
+            per_value[j] = scalar(j)
+    return np.asarray(per_value, dtype=bool)[codes]
+
+
+def _display_value(store: ProductStore, col: str, i: int) -> str:
+    """Product value shown in the comparison table for row i."""
+    if col not in store.text_codes:
+        return "N/A"
+    v = store.text_values[col][store.text_codes[col][i]]
+    return "—" if v in ("nan", "None") else v
+
 
 def match_line_item(line_item_text: str, product_db) -> Dict:
     """
     Match one scope line item against the full product DB.
+    product_db may be the DataFrame or its ProductStore.
     Returns:
       - rfp_specs:    extracted spec dict
       - top_3:        top-3 OEM products with Spec Match % and comparison table
       - selected_sku: the #1 ranked product
     """
-    rfp_specs  = extract_rfp_specs(line_item_text)
-    candidates = []
-
-    for _, row in product_db.iterrows():
-        match_pct, component_matches = compute_spec_match(rfp_specs, row)
-        if match_pct > 0:
-            # Build comparison table: RFP requirement vs product value, per spec
-            comparison_table = {}
-            for spec_key, db_col in SPEC_TO_DB_COL.items():
-                rfp_val  = rfp_specs.get(spec_key) or "Not specified"
-                prod_val = str(row[db_col]) if db_col in row.index else "N/A"
-                match_result = component_matches.get(spec_key, "N/A")
-                comparison_table[spec_key] = {
-                    "rfp_requirement": rfp_val,
-                    "product_value":   prod_val if prod_val not in ("nan", "None") else "—",
-                    "match":           match_result,
-                }
-
-            candidates.append({
-                "product_id":         row["Product_ID"],
-                "product_name":       row["Product_Name"],
-                "category":           row["Category"],
-                "spec_match_percent": match_pct,
-                "component_matches":  component_matches,
-                "comparison_table":   comparison_table,
-                "unit_price":         float(row["Unit_Price_INR_per_meter"]),
-                "moq":                int(row["Min_Order_Qty_Meters"]),
-                "lead_time_days":     int(row["Lead_Time_Days"]),
-                "bis_certified":      str(row["BIS_Certified"]),
-            })
-
-    candidates.sort(key=lambda x: x["spec_match_percent"], reverse=True)
-    top_3 = candidates[:3]
+    store     = (product_db if isinstance(product_db, ProductStore)
+                 else ProductStore.from_dataframe(product_db))
+    rfp_specs = extract_rfp_specs(line_item_text)
+
+    # ── Weighted hits for every product at once (see prepare_spec_plan) ──
+    plan, total_weight = prepare_spec_plan(rfp_specs)
+    hits     = {}     # spec_key → bool per row, for specified specs only
+    weighted = np.zeros(len(store), dtype=np.int64)
+    for spec_key, rfp_val, weight, _ in plan:
+        hit            = _spec_hits(store, spec_key, rfp_val, _norm(rfp_val))
+        hits[spec_key] = hit
+        weighted      += weight * hit
+
+    # Spec Match % for each possible weighted hit count (none specified → 0%)
+    pct_for = [round((k / total_weight) * 100, 2) if total_weight else 0.0
+               for k in range(total_weight + 1)]
+
+    # Pick the winners from the hit counts alone (pct_for is increasing in the
+    # count, ties stay in catalogue order); only they get the full row dicts.
+    cand    = np.flatnonzero(weighted > 0)
+    winners = cand[top_k_indices(weighted[cand], 3)].tolist()
+
+    cols    = store.columns
+    top_3   = []
+    for i in winners:
+        component_matches = {
+            spec_key: ("Match" if hits[spec_key][i] else "No Match") if spec_key in hits
+                      else "N/A (not specified)"
+            for spec_key in SPEC_TO_DB_COL
+        }
+
+        # Build comparison table: RFP requirement vs product value, per spec
+        comparison_table = {}
+        for spec_key in SPEC_TO_DB_COL:
+            rfp_val  = rfp_specs.get(spec_key) or "Not specified"
+            prod_val = _display_value(store, SPEC_TO_DB_COL[spec_key], i)
+            match_result = component_matches.get(spec_key, "N/A")
+            comparison_table[spec_key] = {
+                "rfp_requirement": rfp_val,
+                "product_value":   prod_val,
+                "match":           match_result,
+            }
+
+        top_3.append({
+            "product_id":         cols["Product_ID"][i],
+            "product_name":       cols["Product_Name"][i],
+            "category":           cols["Category"][i],
+            "spec_match_percent": pct_for[weighted[i]],
+            "component_matches":  component_matches,
+            "comparison_table":   comparison_table,
+            "unit_price":         float(cols["Unit_Price_INR_per_meter"][i]),
+            "moq":                int(cols["Min_Order_Qty_Meters"][i]),
+            "lead_time_days":     int(cols["Lead_Time_Days"][i]),
+            "bis_certified":      str(cols["BIS_Certified"][i]),
+        })
+
     for i, c in enumerate(top_3):
         c["rank"] = i + 1
 
@@ -409,6 +637,12 @@ def match_line_item(line_item_text: str, product_db) -> Dict:
 # SECTION 5 — Final summary table builder
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Stand-ins for a missing #1 / #2 / #3 product, so table rows need no branches
+_EMPTY_SKU = {"product_id": None, "product_name": None, "spec_match_percent": 0,
+              "unit_price": 0, "moq": 0, "lead_time_days": 0}
+_NO_RANK   = {"product_id": None, "spec_match_percent": None}
+
+
 def build_summary_table(results: List[Dict]) -> List[Dict]:
     """
     Build the clean final table sent to Master Agent and Pricing Agent.
@@ -420,20 +654,22 @@ def build_summary_table(results: List[Dict]) -> List[Dict]:
     table = []
     for r in results:
         top3     = r.get("top_3", [])
-        selected = r.get("selected_sku")
+        selected = r.get("selected_sku") or _EMPTY_SKU
+        rank_2   = top3[1] if len(top3) > 1 else _NO_RANK
+        rank_3   = top3[2] if len(top3) > 2 else _NO_RANK
         table.append({
             "line_item":        r["line_item"][:120],
             "rfp_specs":        r["rfp_specs"],
-            "selected_sku":     selected["product_id"]         if selected else None,
-            "selected_name":    selected["product_name"]        if selected else None,
-            "spec_match_%":     selected["spec_match_percent"]  if selected else 0,
-            "rank_2_sku":       top3[1]["product_id"]           if len(top3) > 1 else None,
-            "rank_2_match_%":   top3[1]["spec_match_percent"]   if len(top3) > 1 else None,
-            "rank_3_sku":       top3[2]["product_id"]           if len(top3) > 2 else None,
-            "rank_3_match_%":   top3[2]["spec_match_percent"]   if len(top3) > 2 else None,
-            "unit_price_inr":   selected["unit_price"]          if selected else 0,
-            "moq_meters":       selected["moq"]                 if selected else 0,
-            "lead_time_days":   selected["lead_time_days"]      if selected else 0,
+            "selected_sku":     selected["product_id"],
+            "selected_name":    selected["product_name"],
+            "spec_match_%":     selected["spec_match_percent"],
+            "rank_2_sku":       rank_2["product_id"],
+            "rank_2_match_%":   rank_2["spec_match_percent"],
+            "rank_3_sku":       rank_3["product_id"],
+            "rank_3_match_%":   rank_3["spec_match_percent"],
+            "unit_price_inr":   selected["unit_price"],
+            "moq_meters":       selected["moq"],
+            "lead_time_days":   selected["lead_time_days"],
         })
     return table
 
@@ -449,6 +685,8 @@ def technical_agent(state: dict) -> dict:
     Reads from state:
         technical_summary  — prepared by master_agent_start
         product_db
+        product_index      — optional ProductStore built at load time
+        verbose            — optional; False skips the console report
 
     Writes to state:
         line_item_matches  — full per-item results (for Master Agent PDF)
@@ -467,11 +705,15 @@ def technical_agent(state: dict) -> dict:
     # ── Parse line items ──────────────────────────────────────────────────
     line_items = parse_scope_into_line_items(scope_text)
 
-    print(f"\n🔧 Technical Agent: {len(line_items)} line item(s) parsed from scope of supply:")
-    for i, item in enumerate(line_items, 1):
-        print(f"   {i}. {item[:90]}{'...' if len(item) > 90 else ''}")
+    # Console report, written in one go at the end (see pricing_agent)
+    verbose = state.get("verbose", True)
+    report  = [f"\n🔧 Technical Agent: {len(line_items)} line item(s) parsed from scope of supply:\n"]
+    report.extend(f"   {i}. {item[:90]}{'...' if len(item) > 90 else ''}\n"
+                  for i, item in enumerate(line_items, 1))
 
     if not line_items:
+        if verbose:
+            sys.stdout.write("".join(report))
         print("⚠️  Technical Agent: No line items found.")
         state["line_item_matches"] = []
         state["tech_matches"]      = []
@@ -479,32 +721,41 @@ def technical_agent(state: dict) -> dict:
         return state
 
     # ── Match each line item ──────────────────────────────────────────────
+    # Matching is a few numpy ops plus Python per distinct value (~60 µs an
+    # item) and holds the GIL, so a thread pool costs more than it saves.
+    # Results are collected first and logged in order below.
+    store   = state.get("product_index") or ProductStore.from_dataframe(product_db)
+    matched = [match_line_item(item, store) for item in line_items]
+
     results = []
-    for item_text in line_items:
-        result   = match_line_item(item_text, product_db)
+    for item_text, result in zip(line_items, matched):
         selected = result["selected_sku"]
         label    = item_text[:65] + ("..." if len(item_text) > 65 else "")
 
-        print(f"\n   📦 {label}")
+        report.append(f"\n   📦 {label}\n")
         if selected:
-            print(f"      ✅ #1  {selected['product_id']:<40} {selected['spec_match_percent']}% match")
+            report.append(f"      ✅ #1  {selected['product_id']:<40} {selected['spec_match_percent']}% match\n")
         for m in result["top_3"][1:]:
-            print(f"         #{m['rank']}  {m['product_id']:<40} {m['spec_match_percent']}% match")
+            report.append(f"         #{m['rank']}  {m['product_id']:<40} {m['spec_match_percent']}% match\n")
         if not selected:
-            print(f"      ❌ No matching product found")
+            report.append(f"      ❌ No matching product found\n")
 
         results.append(result)
 
     # ── Build final summary table ─────────────────────────────────────────
     summary_table = build_summary_table(results)
 
-    print(f"\n📋 Final SKU Summary Table ({len(summary_table)} item(s)):")
-    print(f"   {'#':<3} {'Line Item':<45} {'Selected SKU':<40} {'Match%'}")
-    print(f"   {'-'*3} {'-'*45} {'-'*40} {'-'*6}")
+    report.append(f"\n📋 Final SKU Summary Table ({len(summary_table)} item(s)):\n")
+    report.append(f"   {'#':<3} {'Line Item':<45} {'Selected SKU':<40} {'Match%'}\n")
+    report.append(f"   {'-'*3} {'-'*45} {'-'*40} {'-'*6}\n")
     for i, row in enumerate(summary_table, 1):
         sku   = row["selected_sku"] or "—"
         match = f"{row['spec_match_%']}%" if row["selected_sku"] else "—"
-        print(f"   {i:<3} {row['line_item'][:45]:<45} {sku:<40} {match}")
+        report.append(f"   {i:<3} {row['line_item'][:45]:<45} {sku:<40} {match}\n")
+
+    if verbose:
+        sys.stdout.write("".join(report))
+        sys.stdout.flush()
 
     # ── Write to state ────────────────────────────────────────────────────
     tech_matches = [r["selected_sku"] for r in results if r["selected_sku"]]
@@ -542,14 +793,13 @@ def technical_agent(state: dict) -> dict:
 
 
     # ── Push to Supabase ──────────────────────────────────────────────────
-    import json as _json
     project_name = state.get("rfps", [{}])[0].get("projectName", "unknown")
     try:
-        push_to_table("technical_results", {
+        push_to_table_async("technical_results", {
             "project_name":      project_name,
             "line_items_parsed": len(line_items),
-            "sku_summary_table": _json.loads(_json.dumps(summary_table, default=str)),
-            "full_output":       _json.loads(_json.dumps(agent_output, default=str)),
+            "sku_summary_table": to_json_safe(summary_table),
+            "full_output":       to_json_safe(agent_output),
         })
     except Exception as e:
         print(f"⚠️  Failed to push technical results to DB: {e}")
@@ -7,57 +7,117 @@ sales_agent scrapes all of them and picks the best tender overall.
 """
 
 from flask import Flask, request, jsonify, send_file, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 import io
 import tempfile
 import requests
 from werkzeug.utils import secure_filename
-import json
 from datetime import datetime
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:          # optional speed-up; Flask's stdlib json is the fallback
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:          # optional; responses go out uncompressed without it
+    Compress = None
+
 from graph import build_graph
-from utils.loader import load_oem
+from agents.sales_agent import prefetch_tenders
+from agents.technical_agent import load_product_catalog
 from config import OEM_PATH
 from services.formatter import format_rfp
-import PyPDF2
+from services.pdf_extract import extract_with_fallback
+
+class PipelineJSONProvider(DefaultJSONProvider):
+    """
+    jsonify() for pipeline results in a single pass: numpy values become
+    plain numbers/lists, anything else unknown goes through str().
+    Uses orjson when installed, falling back to the stdlib encoder for
+    anything orjson rejects (e.g. ints wider than 64 bits).
+    """
+    @staticmethod
+    def default(o):
+        if isinstance(o, np.generic):
+            return o.item()
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        return str(o)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or "cls" in kwargs:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = PipelineJSONProvider(app)
 CORS(app)
 
+# gzip JSON/HTML responses (negotiated via Accept-Encoding); PDFs are left as-is
+app.config['COMPRESS_ALGORITHM'] = 'gzip'
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+if Compress is not None:
+    Compress(app)
+
 UPLOAD_FOLDER = tempfile.gettempdir()
 ALLOWED_EXTENSIONS = {'pdf'}
 MAX_FILE_SIZE = 16 * 1024 * 1024
+UPLOAD_COPY_BUFFER = 1024 * 1024   # 1 MB chunks when saving uploads (Werkzeug default: 16 KB)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
 try:
-    PRODUCT_DB = load_oem(OEM_PATH)
+    PRODUCT_DB, PRODUCT_INDEX = load_product_catalog(OEM_PATH)
     TEST_SERVICES_DB = pd.read_excel(OEM_PATH, sheet_name="Testing Services")
     print(f"✅ Loaded {len(PRODUCT_DB)} products and {len(TEST_SERVICES_DB)} test services")
 except Exception as e:
     print(f"⚠️  Warning: Could not load database: {e}")
     PRODUCT_DB = None
+    PRODUCT_INDEX = None
     TEST_SERVICES_DB = None
 
 
+@lru_cache(maxsize=1)
+def get_graph():
+    """Compiled pipeline graph, built on first use and shared by every request."""
+    return build_graph()
+
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
 def extract_text_from_pdf(pdf_path):
-    text = ""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-    except Exception as e:
-        raise Exception(f"Failed to extract text from PDF: {str(e)}")
-    return text.strip()
+    """
+    Text of an uploaded PDF. Tries each installed engine (PyMuPDF, pypdfium2,
+    PyPDF2) until one returns enough text; see services/pdf_extract.py.
+    """
+    return extract_with_fallback(pdf_path)
 
 
 def process_tender_data(tender_text, source_info):
@@ -89,9 +149,10 @@ def process_tender_data(tender_text, source_info):
         "submissionDeadline": source_info.get('deadline', ''),
     })
 
-    graph = build_graph()
+    graph = get_graph()
     state = {
         "product_db": PRODUCT_DB,
+        "product_index": PRODUCT_INDEX,
         "test_services_db": TEST_SERVICES_DB,
         "rfps": [structured_rfp],
     }
@@ -108,11 +169,16 @@ def process_tender_urls(urls, source_info):
     if PRODUCT_DB is None:
         raise Exception("Product database not loaded")
 
-    graph = build_graph()
+    # Start scraping now so the network wait overlaps the rest of the setup
+    tender_prefetch = prefetch_tenders(urls)
+
+    graph = get_graph()
     state = {
         "product_db": PRODUCT_DB,
+        "product_index": PRODUCT_INDEX,
         "test_services_db": TEST_SERVICES_DB,
         "source_urls": urls,   # ← sales_agent reads this
+        "_tender_prefetch": tender_prefetch,
     }
 
     print(f"🚀 Running pipeline with {len(urls)} source URL(s): {urls}")
@@ -160,16 +226,31 @@ def index():
     return render_template('index.html')
 
 
+# Tables behind /api/agents/all → columns the page uses
+_AGENT_TABLES = {
+    "scoring":  ("scoring_results",   "*"),
+    "tenders":  ("tenders",           "project_name,submission_deadline"),
+    "tech":     ("technical_results", "*"),
+    "pricing":  ("pricing_results",   "*"),
+}
+
+
 @app.route("/api/agents/all")
 def get_all_agents():
     from services.supabase_client import get_from_table
     agents = {}
     try:
-        scoring = get_from_table("scoring_results")
+        # Independent round trips — run them side by side
+        with ThreadPoolExecutor(max_workers=len(_AGENT_TABLES)) as pool:
+            futures = {
+                key: pool.submit(get_from_table, table, columns=columns)
+                for key, (table, columns) in _AGENT_TABLES.items()
+            }
+        scoring, tenders, tech, pricing = (futures[key].result() for key in _AGENT_TABLES)
+
         if scoring:
             agents["scoring_agent"] = scoring[-1]
 
-        tenders = get_from_table("tenders")
         if tenders:
             agents["sales_agent"] = {
                 "tenders_in_window": len(tenders),
@@ -180,11 +261,9 @@ def get_all_agents():
                 "selected_rfp": tenders[0].get("project_name", ""),
             }
 
-        tech = get_from_table("technical_results")
         if tech:
             agents["technical_agent"] = tech[-1].get("full_output", tech[-1])
 
-        pricing = get_from_table("pricing_results")
         if pricing:
             agents["pricing_agent"] = pricing[-1].get("full_output", pricing[-1])
     except Exception as e:
@@ -236,7 +315,6 @@ def analyze_url():
         }
 
         result = process_tender_urls(urls, source_info)
-        result = json.loads(json.dumps(result, default=str))
         return jsonify({'success': True, 'data': result})
 
     except Exception as e:
@@ -258,7 +336,7 @@ def analyze_pdf():
 
         filename = secure_filename(file.filename)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        file.save(filepath, buffer_size=UPLOAD_COPY_BUFFER)
 
         try:
             tender_text = extract_text_from_pdf(filepath)
@@ -275,7 +353,6 @@ def analyze_pdf():
             }
 
             result = process_tender_data(tender_text, source_info)
-            result = json.loads(json.dumps(result, default=str))
             return jsonify({'success': True, 'data': result})
 
         finally:
@@ -296,11 +373,13 @@ def download_report():
 
         from pdf_generator_v2 import generate_rfp_pdf
         rfp_data = data.get("final_response") or data
-        pdf_bytes = generate_rfp_pdf(rfp_data)
+        # Build straight into the response buffer — no disk write, no extra copy
+        pdf_buffer = generate_rfp_pdf(rfp_data, io.BytesIO())
+        pdf_buffer.seek(0)
         output_filename = f"rfp_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
         return send_file(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             as_attachment=True,
             download_name=output_filename,
             mimetype='application/pdf'
@@ -331,4 +410,5 @@ if __name__ == '__main__':
     print(f"🧪 Test services: {len(TEST_SERVICES_DB) if TEST_SERVICES_DB is not None else 0}")
     print("🌐 Starting server at http://localhost:5001")
     print("="*60 + "\n")
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    # Dev server only — production runs under gunicorn (gunicorn.conf.py)
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1", host='0.0.0.0', port=5001)
\ No newline at end of file
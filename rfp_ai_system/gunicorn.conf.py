@@ -0,0 +1,25 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for app:app (read automatically from the working
+directory, or pass --config gunicorn.conf.py).
+
+Analysis requests spend most of their time waiting on the scraper, Gemini
+and Supabase, so each worker runs a pool of threads. preload_app loads the
+product catalogue once in the master and shares it copy-on-write with the
+forked workers; thread pools and the pipeline graph are created lazily, so
+nothing thread-bound is inherited across the fork.
+
+Every worker holds its own pandas/numpy heap, so the worker count is a
+fixed, conservative default rather than derived from cpu_count() (which
+reports the host's cores inside a container); raise it per deployment with
+WEB_CONCURRENCY.
+"""
+
+import os
+
+bind         = os.getenv("BIND", "0.0.0.0:5001")
+workers      = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads      = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout      = 300          # a full pipeline run (scrape + LLM + PDF) can be slow
+preload_app  = True
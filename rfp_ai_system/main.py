@@ -3,21 +3,43 @@
 Entry point — loads both DB sheets and runs the pipeline.
 """
 
+from dataclasses import dataclass
+
 from graph import build_graph
-from utils.loader import load_oem
+from agents.technical_agent import load_product_catalog
 from config import OEM_PATH, TENDER_SITE
-import pandas as pd
+from utils.loader import load_sheets
 
 
-def main():
-    # Load product catalog
-    product_db = load_oem(OEM_PATH)
+@dataclass(slots=True)
+class LineItemSummary:
+    """The fields of one final_response line item that the console summary prints."""
+    line_item:     str
+    sku_id:        str   = "N/A"
+    material_cost: float = 0
+    test_cost:     float = 0
+    line_total:    float = 0
+
+    @classmethod
+    def from_dict(cls, item: dict) -> "LineItemSummary":
+        return cls(
+            item["line_item"],
+            (item.get("selected_sku") or {}).get("product_id", "N/A"),
+            item.get("material_cost_inr", 0),
+            item.get("test_cost_inr", 0),
+            item.get("line_total_inr", 0),
+        )
 
-    # Load testing services (needed by pricing agent)
-    test_services_db = pd.read_excel(OEM_PATH, sheet_name="Testing Services")
 
-    # FIX 1 & 2 — Load Volume Discounts sheet
-    volume_discounts_db = pd.read_excel(OEM_PATH, sheet_name="Volume Discounts")
+def main():
+    # Load product catalog (and its matcher index)
+    product_db, product_index = load_product_catalog(OEM_PATH)
+
+    # Testing services (needed by pricing agent) and, for Fix 1 & 2, the
+    # Volume Discounts sheet — both read from a single workbook open
+    sheets = load_sheets(OEM_PATH, ["Testing Services", "Volume Discounts"])
+    test_services_db    = sheets["Testing Services"]
+    volume_discounts_db = sheets["Volume Discounts"]
 
     print(f"✅ Loaded {len(product_db)} products, "
           f"{len(test_services_db)} test services, "
@@ -28,6 +50,7 @@ def main():
     state = {
         "base_url":            TENDER_SITE,
         "product_db":          product_db,
+        "product_index":       product_index,   # columnar view for matching
         "test_services_db":    test_services_db,
         "volume_discounts_db": volume_discounts_db,   # NEW — for Fix 1 & 2
     }
@@ -43,13 +66,14 @@ def main():
         print(f"Project : {final.get('project_name')}")
         print(f"Issued  : {final.get('issued_by')}")
         print(f"Deadline: {final.get('deadline')}")
-        print(f"\nLine Items ({len(final.get('line_items', []))}):")
-        for item in final.get("line_items", []):
-            print(f"\n  📦 {item['line_item'][:70]}")
-            print(f"     SKU          : {item.get('selected_sku', {}).get('product_id', 'N/A')}")
-            print(f"     Material Cost: ₹{item.get('material_cost_inr', 0):,.0f}")
-            print(f"     Test Cost    : ₹{item.get('test_cost_inr', 0):,.0f}")
-            print(f"     Line Total   : ₹{item.get('line_total_inr', 0):,.0f}")
+        items = [LineItemSummary.from_dict(d) for d in final.get("line_items", [])]
+        print(f"\nLine Items ({len(items)}):")
+        for item in items:
+            print(f"\n  📦 {item.line_item[:70]}")
+            print(f"     SKU          : {item.sku_id}")
+            print(f"     Material Cost: ₹{item.material_cost:,.0f}")
+            print(f"     Test Cost    : ₹{item.test_cost:,.0f}")
+            print(f"     Line Total   : ₹{item.line_total:,.0f}")
         s = final.get("summary", {})
         print(f"\n  Total Material : ₹{s.get('total_material_cost_inr', 0):,.0f}")
         print(f"  Total Tests    : ₹{s.get('total_test_cost_inr', 0):,.0f}")
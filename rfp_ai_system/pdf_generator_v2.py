@@ -12,6 +12,7 @@ import os
 import io
 import re as _re
 from datetime import datetime
+from functools import lru_cache, partial
 
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
@@ -23,6 +24,7 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT, TA_LEFT
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import registerFontFamily
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus.flowables import Flowable
 from reportlab.graphics.shapes import Drawing, Rect, String, Line
@@ -58,6 +60,8 @@ _bpath = _find_font(_BOLD_CANDIDATES)
 if _npath and _bpath:
     pdfmetrics.registerFont(TTFont("DV",   _npath))
     pdfmetrics.registerFont(TTFont("DV-B", _bpath))
+    # Map <b> inside DV paragraphs to the bold face (no italic face is bundled)
+    registerFontFamily("DV", normal="DV", bold="DV-B", italic="DV", boldItalic="DV-B")
     FONT_NORMAL = "DV"
     FONT_BOLD   = "DV-B"
     print(f"[PDF] Using TTF font: {os.path.basename(_npath)}")
@@ -86,8 +90,18 @@ RULE_GREY   = colors.HexColor("#D0D7E0")
 C_MUTED     = colors.HexColor("#888888")
 C_TEXT      = colors.HexColor("#1A1A2E")
 C_TEXT_MID  = colors.HexColor("#4A4A6A")
+SELECT_BG   = colors.HexColor("#E8F8F0")   # selected SKU row
+COVER_SUB   = colors.HexColor("#BFD4F0")   # cover subtitle on navy band
+COVER_META  = colors.HexColor("#C8DCF5")
 WHITE       = colors.white
 
+# Bid recommendation bands: (min score, label, text colour, background)
+_REC_BANDS = (
+    (75, "PROCEED WITH BID", C_GREEN, GREEN_BG),
+    (50, "REVIEW REQUIRED",  C_AMBER, AMBER_BG),
+)
+_REC_DEFAULT = ("DO NOT PROCEED", C_RED, RED_BG)
+
 
 # ─── Safe formatting helpers (unchanged from v2) ─────────────────────────────
 
@@ -110,7 +124,18 @@ def _f(x, default: float = 0.0) -> float:
 
 
 def _inr(val, decimals: int = 0) -> str:
-    return f"\u20b9 {_f(val):,.{decimals}f}"
+    # + 0.0 folds -0.0 into 0.0, which would otherwise share its cache entry
+    return _inr_fmt(_f(val) + 0.0, decimals)
+
+
+_INR_SPECS = {0: ",.0f", 2: ",.2f"}   # the precisions the report uses
+
+
+@lru_cache(maxsize=2048)
+def _inr_fmt(v: float, decimals: int) -> str:
+    # Totals and unit prices repeat across the summary, pricing and SKU sections
+    spec = _INR_SPECS.get(decimals) or f",.{decimals}f"
+    return "\u20b9 " + format(v, spec)
 
 
 def _pct(val) -> str:
@@ -127,8 +152,8 @@ def _days(val) -> str:
         return "N/A"
 
 
-def _date(include_time: bool = False) -> str:
-    now = datetime.now()
+def _date(include_time: bool = False, now: datetime = None) -> str:
+    now = now or datetime.now()
     base = f"{now.day} {now.strftime('%B %Y')}"
     return f"{base} at {now.strftime('%H:%M')}" if include_time else base
 
@@ -152,6 +177,14 @@ def _match_icon(match_str: str) -> str:
     return "\u2013"
 
 
+# Font colour (hex, no '#') for each _match_icon result
+_ICON_HEX = {
+    "\u2713": C_GREEN.hexval()[2:],
+    "\u2717": C_RED.hexval()[2:],
+    "\u2013": C_MUTED.hexval()[2:],
+}
+
+
 # ─── Score gauge (horizontal progress bar from design 2) ─────────────────────
 
 def _score_gauge(score_0_to_100: float) -> Drawing:
@@ -189,7 +222,8 @@ def _score_gauge(score_0_to_100: float) -> Drawing:
 
 # ─── Header / Footer ─────────────────────────────────────────────────────────
 
-def _header_footer(canvas_obj, doc):
+def _header_footer(canvas_obj, doc, report_date: str = None):
+    """Runs on every page; generate_rfp_pdf binds report_date once per report."""
     canvas_obj.saveState()
     W, H = A4
     LM = 0.75 * inch
@@ -211,7 +245,7 @@ def _header_footer(canvas_obj, doc):
 
         canvas_obj.setFont(FONT_NORMAL, 7.5)
         canvas_obj.setFillColor(C_MUTED)
-        canvas_obj.drawRightString(RM, H - 0.46 * inch, _date())
+        canvas_obj.drawRightString(RM, H - 0.46 * inch, report_date or _date())
 
     # Footer
     canvas_obj.setStrokeColor(NAVY)
@@ -247,7 +281,7 @@ def _cover_page(canvas_obj, doc):
 
 # ─── Style factory ────────────────────────────────────────────────────────────
 
-def _styles():
+def _build_styles():
     base = getSampleStyleSheet()
 
     def ps(name, **kw):
@@ -256,9 +290,9 @@ def _styles():
 
     ps("DocTitle",    fontSize=28, textColor=WHITE, alignment=TA_CENTER,
        fontName=FONT_BOLD, leading=34, spaceAfter=4)
-    ps("DocSubtitle", fontSize=13, textColor=colors.HexColor("#BFD4F0"),
+    ps("DocSubtitle", fontSize=13, textColor=COVER_SUB,
        alignment=TA_CENTER, spaceAfter=6)
-    ps("CoverMeta",   fontSize=10, textColor=colors.HexColor("#C8DCF5"),
+    ps("CoverMeta",   fontSize=10, textColor=COVER_META,
        alignment=TA_CENTER, spaceAfter=3)
 
     ps("SectionHeader", fontSize=11, textColor=WHITE, fontName=FONT_BOLD,
@@ -278,25 +312,90 @@ def _styles():
     return base
 
 
+# Built once at import — the sheet is read-only configuration shared by every report
+_STYLES = _build_styles()
+
+# Standalone styles for fixed one-off cells (no sample-sheet parent)
+_KPI_LABEL_STYLE = ParagraphStyle("_KL", fontName=FONT_NORMAL, fontSize=7.5, leading=10,
+                                  textColor=C_MUTED, alignment=TA_CENTER)
+_PROJECT_CARD_TEXT = ParagraphStyle("_PC", fontName=FONT_BOLD, fontSize=13,
+                                    textColor=NAVY, alignment=TA_CENTER, leading=16)
+_TOC_STYLE    = ParagraphStyle("_TOC", fontName=FONT_NORMAL, fontSize=10, textColor=NAVY)
+_DETAIL_KEY   = ParagraphStyle("_DK", fontName=FONT_BOLD, fontSize=9, textColor=NAVY)
+
+
+# ─── Fixed table styles (read-only, shared by every report) ──────────────────
+
+_SECTION_STYLE = TableStyle([
+    ("BACKGROUND",    (0, 0), (-1, -1), NAVY),
+    ("LEFTPADDING",   (0, 0), (-1, -1), 12),
+    ("RIGHTPADDING",  (0, 0), (-1, -1), 12),
+    ("TOPPADDING",    (0, 0), (-1, -1), 8),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+    ("LINEABOVE",     (0, 0), (-1,  0), 3, ACCENT_GOLD),
+])
+
+_KPI_STRIP_STYLE = TableStyle([
+    ("BACKGROUND",    (0, 0), (-1, -1), WHITE),
+    ("BOX",           (0, 0), (-1, -1), 1,   RULE_GREY),
+    ("INNERGRID",     (0, 0), (-1, -1), 0.5, RULE_GREY),
+    ("LINEABOVE",     (0, 0), (-1,  0), 3,   NAVY),
+    ("TOPPADDING",    (0, 0), (-1, -1), 12),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 12),
+    ("ALIGN",         (0, 0), (-1, -1), "CENTER"),
+    ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
+])
+
+_PROJECT_CARD_STYLE = TableStyle([
+    ("BACKGROUND",    (0, 0), (-1, -1), WHITE),
+    ("BOX",           (0, 0), (-1, -1), 2, NAVY),
+    ("LINEABOVE",     (0, 0), (-1,  0), 4, ACCENT_GOLD),
+    ("ALIGN",         (0, 0), (-1, -1), "CENTER"),
+    ("TOPPADDING",    (0, 0), (-1, -1), 18),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 18),
+])
+
+_COVER_TABLE_STYLE = TableStyle([
+    ("LINEBELOW",     (0, 0), (-1, -2), 0.5, RULE_GREY),
+    ("TOPPADDING",    (0, 0), (-1, -1), 9),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 9),
+    ("LEFTPADDING",   (1, 0), (1, -1),  12),
+    ("RIGHTPADDING",  (0, 0), (0, -1),  8),
+    ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
+])
+
+_TOC_ROW_STYLE = TableStyle([
+    ("LINEBELOW",     (0, 0), (-1, -1), 0.5, RULE_GREY),
+    ("TOPPADDING",    (0, 0), (-1, -1), 8),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+    ("LEFTPADDING",   (0, 0), (-1, -1), 8),
+])
+
+_SIGN_OFF_STYLE = TableStyle([
+    ("FONTSIZE",      (0, 0), (-1, -1), 9),
+    ("FONTNAME",      (0, 0), (0, -1),  FONT_BOLD),
+    ("TEXTCOLOR",     (0, 0), (0, -1),  NAVY),
+    ("FONTNAME",      (2, 0), (2, -1),  FONT_BOLD),
+    ("TEXTCOLOR",     (2, 0), (2, -1),  NAVY),
+    ("VALIGN",        (0, 0), (-1, -1), "BOTTOM"),
+    ("TOPPADDING",    (0, 0), (-1, -1), 10),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+])
+
+
 # ─── Section header block (navy band with gold top rule, design 2 style) ─────
 
 def _section_block(title, styles):
     tbl = Table([[Paragraph(title, styles["SectionHeader"])]],
                 colWidths=[7.0 * inch])
-    tbl.setStyle(TableStyle([
-        ("BACKGROUND",    (0, 0), (-1, -1), NAVY),
-        ("LEFTPADDING",   (0, 0), (-1, -1), 12),
-        ("RIGHTPADDING",  (0, 0), (-1, -1), 12),
-        ("TOPPADDING",    (0, 0), (-1, -1), 8),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-        ("LINEABOVE",     (0, 0), (-1,  0), 3, ACCENT_GOLD),
-    ]))
+    tbl.setStyle(_SECTION_STYLE)
     return tbl
 
 
 # ─── Table style preset ───────────────────────────────────────────────────────
 
-def _ts(header_bg=NAVY):
+def _ts(header_bg=NAVY, extra=()):
+    """Standard grid table style; ``extra`` commands are appended after the preset."""
     return TableStyle([
         ("BACKGROUND",    (0, 0), (-1,  0), header_bg),
         ("TEXTCOLOR",     (0, 0), (-1,  0), WHITE),
@@ -314,9 +413,59 @@ def _ts(header_bg=NAVY):
         ("LINEBELOW",     (0, 0), (-1,  0), 1, C_ACCENT),
         ("GRID",          (0, 0), (-1, -1), 0.4, RULE_GREY),
         ("ROWBACKGROUNDS",(0, 1), (-1, -1), [WHITE, LIGHT_BLUE]),
+        *extra,
     ])
 
 
+# Per-table presets, built once — every report (and every line item) shares them
+_GRID_STYLE       = _ts()
+_COMPARISON_STYLE = _ts(header_bg=STEEL)
+
+_COST_SUMMARY_STYLE = _ts(extra=[
+    ("ALIGN",      (1, 0),  (1, -1),  "RIGHT"),
+    ("FONTNAME",   (0, -1), (-1, -1), FONT_BOLD),
+    ("BACKGROUND", (0, -1), (-1, -1), LIGHT_BLUE),
+    ("TEXTCOLOR",  (0, -1), (-1, -1), NAVY),
+])
+
+_FACTOR_STYLE = _ts(extra=[
+    ("ALIGN",      (1, 0),  (1, -1),  "CENTER"),
+    ("ALIGN",      (2, 0),  (2, -1),  "CENTER"),
+    ("ALIGN",      (4, 0),  (4, -1),  "RIGHT"),
+    ("FONTNAME",   (3, 1),  (3, -2),  "Courier"),
+    ("FONTSIZE",   (3, 1),  (3, -2),  7.5),
+    ("TEXTCOLOR",  (3, 1),  (3, -2),  C_ACCENT),
+    ("FONTNAME",   (0, -1), (-1, -1), FONT_BOLD),
+    ("BACKGROUND", (0, -1), (-1, -1), LIGHT_BLUE),
+    ("TEXTCOLOR",  (0, -1), (-1, -1), NAVY),
+    ("SPAN",       (0, -1), (3, -1)),
+    ("ALIGN",      (0, -1), (3, -1),  "RIGHT"),
+])
+
+_TOP3_STYLE = _ts(extra=[
+    ("ALIGN",      (2, 0), (2, -1), "CENTER"),
+    ("ALIGN",      (3, 0), (3, -1), "RIGHT"),
+    ("ALIGN",      (4, 0), (5, -1), "CENTER"),
+    # Highlight selected row (row 1 = first data row)
+    ("BACKGROUND", (0, 1), (-1, 1), SELECT_BG),
+    ("LINEABOVE",  (0, 1), (-1, 1), 1.2, C_ACCENT2),
+    ("LINEBELOW",  (0, 1), (-1, 1), 1.2, C_ACCENT2),
+])
+
+_PRICING_STYLE = _ts(extra=[
+    ("ALIGN",      (2, 0),  (-1, -1), "RIGHT"),
+    ("ALIGN",      (0, 0),  (1, -1),  "LEFT"),
+    ("ALIGN",      (3, 0),  (3, -1),  "CENTER"),
+    ("FONTNAME",   (0, -1), (-1, -1), FONT_BOLD),
+    ("BACKGROUND", (0, -1), (-1, -1), LIGHT_BLUE),
+    ("TEXTCOLOR",  (0, -1), (-1, -1), NAVY),
+])
+
+_TEST_STYLE = _ts(extra=[
+    ("ALIGN", (3, 0), (4, -1), "RIGHT"),
+])
+
+
 # ─── KPI metrics strip ────────────────────────────────────────────────────────
 
 def _kpi_strip(metrics):
@@ -324,12 +473,9 @@ def _kpi_strip(metrics):
     metrics: list of (label, value, value_color) tuples.
     Returns a Table flowable.
     """
-    S = _styles()
     cells = [[
         Table(
-            [[Paragraph(label, ParagraphStyle(
-                f"_KL{i}", fontName=FONT_NORMAL, fontSize=7.5, leading=10,
-                textColor=C_MUTED, alignment=TA_CENTER))],
+            [[Paragraph(label, _KPI_LABEL_STYLE)],
              [Paragraph(value, ParagraphStyle(
                 f"_KV{i}", fontName=FONT_BOLD, fontSize=11, leading=14,
                 textColor=vcol, alignment=TA_CENTER))]],
@@ -340,33 +486,34 @@ def _kpi_strip(metrics):
     n = len(metrics)
     col_w = 7.0 * inch / n
     tbl = Table(cells, colWidths=[col_w] * n)
-    tbl.setStyle(TableStyle([
-        ("BACKGROUND",    (0, 0), (-1, -1), WHITE),
-        ("BOX",           (0, 0), (-1, -1), 1,   RULE_GREY),
-        ("INNERGRID",     (0, 0), (-1, -1), 0.5, RULE_GREY),
-        ("LINEABOVE",     (0, 0), (-1,  0), 3,   NAVY),
-        ("TOPPADDING",    (0, 0), (-1, -1), 12),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 12),
-        ("ALIGN",         (0, 0), (-1, -1), "CENTER"),
-        ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
-    ]))
+    tbl.setStyle(_KPI_STRIP_STYLE)
     return tbl
 
 
 # ─── Main generator ───────────────────────────────────────────────────────────
 
-def generate_rfp_pdf(rfp_data: dict) -> bytes:
-    """Generate a PDF report and return raw PDF bytes (no file written to disk)."""
-    buffer = io.BytesIO()
+def generate_rfp_pdf(rfp_data: dict, output=None):
+    """
+    Generate a PDF report and return raw PDF bytes (no file written to disk).
+
+    If ``output`` is a writable binary file-like object, the PDF is built
+    straight into it and ``output`` is returned instead, so callers that
+    stream or persist the report skip the intermediate bytes copy.
+    """
+    buffer = output if output is not None else io.BytesIO()
     doc = SimpleDocTemplate(
         buffer, pagesize=A4,
         leftMargin=0.75 * inch, rightMargin=0.75 * inch,
         topMargin=1.1  * inch, bottomMargin=1.0 * inch,
         title="RFP Bid Evaluation Report",
     )
-    S     = _styles()
+    S     = _STYLES
     story = []
 
+    # One timestamp per report: formatted once, shared by the body and every page header
+    now         = datetime.now()
+    report_date = _date(now=now)
+
     # ── Unpack ──────────────────────────────────────────────────────────────
     project_name = rfp_data.get("project_name", "N/A")
     issued_by    = rfp_data.get("issued_by",    "N/A")
@@ -386,12 +533,9 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
     grand_total = _f(summary.get("grand_total_inr",         0))
 
     # Recommendation styling
-    if bid_score >= 75:
-        rec_text, rec_color, rec_bg = "PROCEED WITH BID", C_GREEN, GREEN_BG
-    elif bid_score >= 50:
-        rec_text, rec_color, rec_bg = "REVIEW REQUIRED",  C_AMBER, AMBER_BG
-    else:
-        rec_text, rec_color, rec_bg = "DO NOT PROCEED",   C_RED,   RED_BG
+    rec_text, rec_color, rec_bg = next(
+        (band[1:] for band in _REC_BANDS if bid_score >= band[0]), _REC_DEFAULT
+    )
 
     grade_c = _grade_color(bid_grade)
 
@@ -402,25 +546,17 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
 
     story.append(Paragraph("TECHNICAL &amp; COMMERCIAL PROPOSAL", S["DocTitle"]))
     story.append(Paragraph("RFP Bid Evaluation Report",            S["DocSubtitle"]))
-    story.append(Paragraph(f"Prepared: {_date()}",                 S["CoverMeta"]))
+    story.append(Paragraph(f"Prepared: {report_date}",           S["CoverMeta"]))
 
     story.append(Spacer(1, 1.4 * inch))   # clear gold stripe into white area
 
     # Project name card
     proj_card = Table(
         [[Paragraph(f"<b>{project_name}</b>",
-                    ParagraphStyle("_PC", fontName=FONT_BOLD, fontSize=13,
-                                   textColor=NAVY, alignment=TA_CENTER, leading=16))]],
+                    _PROJECT_CARD_TEXT)]],
         colWidths=[6.5 * inch]
     )
-    proj_card.setStyle(TableStyle([
-        ("BACKGROUND",    (0, 0), (-1, -1), WHITE),
-        ("BOX",           (0, 0), (-1, -1), 2, NAVY),
-        ("LINEABOVE",     (0, 0), (-1,  0), 4, ACCENT_GOLD),
-        ("ALIGN",         (0, 0), (-1, -1), "CENTER"),
-        ("TOPPADDING",    (0, 0), (-1, -1), 18),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 18),
-    ]))
+    proj_card.setStyle(_PROJECT_CARD_STYLE)
     story.append(proj_card)
     story.append(Spacer(1, 0.4 * inch))
 
@@ -429,21 +565,14 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         ("Tendering Authority",  issued_by),
         ("Submission Deadline",  deadline),
         ("Report Classification","CONFIDENTIAL"),
-        ("Report Date",          _date()),
+        ("Report Date",          report_date),
     ]
     cov_tbl = Table(
         [[Paragraph(k, S["CoverLbl"]), Paragraph(v, S["CoverVal"])]
          for k, v in cover_rows],
         colWidths=[2.1 * inch, 4.4 * inch]
     )
-    cov_tbl.setStyle(TableStyle([
-        ("LINEBELOW",     (0, 0), (-1, -2), 0.5, RULE_GREY),
-        ("TOPPADDING",    (0, 0), (-1, -1), 9),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 9),
-        ("LEFTPADDING",   (1, 0), (1, -1),  12),
-        ("RIGHTPADDING",  (0, 0), (0, -1),  8),
-        ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
-    ]))
+    cov_tbl.setStyle(_COVER_TABLE_STYLE)
     story.append(cov_tbl)
     story.append(Spacer(1, 0.7 * inch))
 
@@ -473,16 +602,10 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
     for num, title in toc_items:
         row = Table(
             [[Paragraph(f"{num}.  {title}",
-                        ParagraphStyle("_TOC", fontName=FONT_NORMAL,
-                                       fontSize=10, textColor=NAVY))]],
+                        _TOC_STYLE)]],
             colWidths=[7.0 * inch]
         )
-        row.setStyle(TableStyle([
-            ("LINEBELOW",     (0, 0), (-1, -1), 0.5, RULE_GREY),
-            ("TOPPADDING",    (0, 0), (-1, -1), 8),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-            ("LEFTPADDING",   (0, 0), (-1, -1), 8),
-        ]))
+        row.setStyle(_TOC_ROW_STYLE)
         story.append(row)
     story.append(PageBreak())
 
@@ -524,13 +647,8 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         ["Total Test & Services Cost", _inr(total_test)],
         ["GRAND TOTAL",                _inr(grand_total)],
     ]
-    s_ts = _ts()
-    s_ts.add("ALIGN",      (1, 0),  (1, -1),  "RIGHT")
-    s_ts.add("FONTNAME",   (0, -1), (-1, -1), FONT_BOLD)
-    s_ts.add("BACKGROUND", (0, -1), (-1, -1), LIGHT_BLUE)
-    s_ts.add("TEXTCOLOR",  (0, -1), (-1, -1), NAVY)
     sum_t = Table(sum_data, colWidths=[4.5 * inch, 2.5 * inch])
-    sum_t.setStyle(s_ts)
+    sum_t.setStyle(_COST_SUMMARY_STYLE)
     story.append(sum_t)
     story.append(PageBreak())
 
@@ -583,21 +701,9 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         f_rows.append([label, wt, f"{raw:.1f}", _score_bar(raw), f"{contrib:.2f}"])
     f_rows.append(["TOTAL BID VIABILITY SCORE", "", "", "", f"{bid_score:.2f}"])
 
-    f_ts = _ts()
-    f_ts.add("ALIGN",      (1, 0),  (1, -1),  "CENTER")
-    f_ts.add("ALIGN",      (2, 0),  (2, -1),  "CENTER")
-    f_ts.add("ALIGN",      (4, 0),  (4, -1),  "RIGHT")
-    f_ts.add("FONTNAME",   (3, 1),  (3, -2),  "Courier")
-    f_ts.add("FONTSIZE",   (3, 1),  (3, -2),  7.5)
-    f_ts.add("TEXTCOLOR",  (3, 1),  (3, -2),  C_ACCENT)
-    f_ts.add("FONTNAME",   (0, -1), (-1, -1), FONT_BOLD)
-    f_ts.add("BACKGROUND", (0, -1), (-1, -1), LIGHT_BLUE)
-    f_ts.add("TEXTCOLOR",  (0, -1), (-1, -1), NAVY)
-    f_ts.add("SPAN",       (0, -1), (3, -1))
-    f_ts.add("ALIGN",      (0, -1), (3, -1),  "RIGHT")
     f_t = Table(f_rows, colWidths=[2.2 * inch, 0.75 * inch, 0.85 * inch, 2.1 * inch, 0.85 * inch],
                 repeatRows=1)
-    f_t.setStyle(f_ts)
+    f_t.setStyle(_FACTOR_STYLE)
     story.append(f_t)
     story.append(PageBreak())
 
@@ -612,7 +718,7 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         ["Project Name",        project_name],
         ["Tendering Authority", issued_by],
         ["Submission Deadline", deadline],
-        ["Evaluation Date",     _date()],
+        ["Evaluation Date",     report_date],
         ["Line Items in Scope", str(len(line_items))],
         ["Grand Total (INR)",   _inr(grand_total)],
         ["Report Status",       "FINAL \u2014 CONFIDENTIAL"],
@@ -621,13 +727,12 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
     styled_proj = [proj_rows[0]]  # header as strings
     for k, v in proj_rows[1:]:
         styled_proj.append([
-            Paragraph(k, ParagraphStyle("_DK", fontName=FONT_BOLD, fontSize=9, textColor=NAVY)),
+            Paragraph(k, _DETAIL_KEY),
             Paragraph(v, S["TableCell"])
         ])
 
-    p_ts = _ts()
     proj_t = Table(styled_proj, colWidths=[2.2 * inch, 4.8 * inch])
-    proj_t.setStyle(p_ts)
+    proj_t.setStyle(_GRID_STYLE)
     story.append(proj_t)
     story.append(PageBreak())
 
@@ -644,9 +749,9 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
     story.append(Spacer(1, 0.15 * inch))
 
     for idx, item in enumerate(line_items, 1):
-        line_text = str(item.get("line_item", f"Item {idx}"))
-        top_3     = item.get("top_3_recommendations", [])
-        selected  = item.get("selected_sku") or {}
+        line_text   = str(item.get("line_item", f"Item {idx}"))
+        top_3       = item.get("top_3_recommendations", [])
+        selected_id = (item.get("selected_sku") or {}).get("product_id")
 
         story.append(KeepTogether([
             Paragraph(
@@ -668,7 +773,7 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         t3h = ["Rank", "SKU / Product Name", "Spec Match", "Unit Price", "Lead Time", "BIS"]
         t3d = [t3h]
         for m in top_3:
-            sel   = m.get("product_id") == selected.get("product_id")
+            sel   = m.get("product_id") == selected_id
             r_lbl = "#1 \u2605 SELECTED" if sel else f"#{m.get('rank', '?')}"
             pid   = str(m.get("product_id",   ""))
             pname = str(m.get("product_name", ""))
@@ -685,52 +790,43 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
                 str(m.get("bis_certified", "N/A")),
             ])
 
-        t3_ts = _ts()
-        t3_ts.add("ALIGN",      (2, 0), (2, -1), "CENTER")
-        t3_ts.add("ALIGN",      (3, 0), (3, -1), "RIGHT")
-        t3_ts.add("ALIGN",      (4, 0), (5, -1), "CENTER")
-        # Highlight selected row (row 1 = first data row)
-        t3_ts.add("BACKGROUND", (0, 1), (-1, 1), colors.HexColor("#E8F8F0"))
-        t3_ts.add("LINEABOVE",  (0, 1), (-1, 1), 1.2, C_ACCENT2)
-        t3_ts.add("LINEBELOW",  (0, 1), (-1, 1), 1.2, C_ACCENT2)
         t3_t = Table(
             t3d,
             colWidths=[1.15 * inch, 2.7 * inch, 0.85 * inch, 1.05 * inch, 0.8 * inch, 0.45 * inch],
             repeatRows=1,
         )
-        t3_t.setStyle(t3_ts)
+        t3_t.setStyle(_TOP3_STYLE)
         story.append(t3_t)
         story.append(Spacer(1, 0.14 * inch))
 
         # Spec comparison table
         story.append(Paragraph("Specification Comparison:", S["SubHead"]))
-        comp_src = top_3[0].get("comparison_table") if top_3 else None
+        # One comparison table per ranked product, looked up once
+        comp_tables = [m.get("comparison_table", {}) for m in top_3]
+        comp_src    = comp_tables[0]
         if comp_src:
             comp_hdr = ["Spec Parameter", "RFP Requirement",
                         "#1 Product Value", "#2 Product Value", "#3 Product Value"]
             comp_rows = [comp_hdr]
-            for sk in comp_src:
+            for sk, first in comp_src.items():
                 label   = sk.replace("_", " ").title()
-                rfp_val = str(top_3[0]["comparison_table"].get(sk, {})
-                              .get("rfp_requirement", "N/A"))
+                rfp_val = str(first.get("rfp_requirement", "N/A"))
                 row = [label, rfp_val]
-                for m in top_3:
-                    ct   = m.get("comparison_table", {}).get(sk, {})
+                for table in comp_tables:
+                    ct   = table.get(sk, {})
                     pv   = str(ct.get("product_value", "\u2013"))
                     if pv in ("nan", "None", ""): pv = "\u2013"
                     icon = _match_icon(ct.get("match", ""))
-                    clr  = C_GREEN if icon == "\u2713" else (C_RED if icon == "\u2717" else C_MUTED)
                     row.append(Paragraph(
-                        f"{pv} &nbsp;<font color='#{clr.hexval()[2:]}'><b>{icon}</b></font>",
+                        f"{pv} &nbsp;<font color='#{_ICON_HEX[icon]}'><b>{icon}</b></font>",
                         S["Cell"]
                     ))
                 comp_rows.append(row)
 
-            comp_ts = _ts(header_bg=STEEL)
             comp_t  = Table(comp_rows,
                             colWidths=[1.4 * inch, 1.15 * inch, 1.55 * inch, 1.55 * inch, 1.35 * inch],
                             repeatRows=1)
-            comp_t.setStyle(comp_ts)
+            comp_t.setStyle(_COMPARISON_STYLE)
             story.append(comp_t)
 
         story.append(Spacer(1, 0.1 * inch))
@@ -769,19 +865,12 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         "TOTAL", "", "", "",
         _inr(total_mat), _inr(total_test), _inr(grand_total),
     ])
-    p_ts2 = _ts()
-    p_ts2.add("ALIGN",      (2, 0),  (-1, -1), "RIGHT")
-    p_ts2.add("ALIGN",      (0, 0),  (1, -1),  "LEFT")
-    p_ts2.add("ALIGN",      (3, 0),  (3, -1),  "CENTER")
-    p_ts2.add("FONTNAME",   (0, -1), (-1, -1), FONT_BOLD)
-    p_ts2.add("BACKGROUND", (0, -1), (-1, -1), LIGHT_BLUE)
-    p_ts2.add("TEXTCOLOR",  (0, -1), (-1, -1), NAVY)
     price_t = Table(
         p_rows,
         colWidths=[0.38 * inch, 2.2 * inch, 1.0 * inch, 0.62 * inch, 1.1 * inch, 1.0 * inch, 0.7 * inch],
         repeatRows=1,
     )
-    price_t.setStyle(p_ts2)
+    price_t.setStyle(_PRICING_STYLE)
     story.append(price_t)
     story.append(Spacer(1, 0.22 * inch))
 
@@ -798,14 +887,12 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
                 _inr(t.get("price_inr", 0)),
                 str(t.get("duration_hours", "")),
             ])
-    t_ts = _ts()
-    t_ts.add("ALIGN", (3, 0), (4, -1), "RIGHT")
     test_t = Table(
         t_rows,
         colWidths=[0.6 * inch, 1.0 * inch, 3.2 * inch, 1.1 * inch, 1.1 * inch],
         repeatRows=1,
     )
-    test_t.setStyle(t_ts)
+    test_t.setStyle(_TEST_STYLE)
     story.append(test_t)
     story.append(PageBreak())
 
@@ -826,7 +913,7 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         ["Submission", "Submit complete bid package before deadline",               "Bid Manager"],
     ]
     act_t = Table(acts, colWidths=[1.1 * inch, 4.4 * inch, 1.5 * inch], repeatRows=1)
-    act_t.setStyle(_ts())
+    act_t.setStyle(_GRID_STYLE)
     story.append(act_t)
     story.append(Spacer(1, 0.28 * inch))
 
@@ -840,27 +927,21 @@ def generate_rfp_pdf(rfp_data: dict) -> bytes:
         ["Approved By:",  "_" * 35, "Date:", "_" * 22],
     ]
     so_t = Table(sign_rows, colWidths=[1.15 * inch, 2.95 * inch, 0.7 * inch, 2.2 * inch])
-    so_t.setStyle(TableStyle([
-        ("FONTSIZE",      (0, 0), (-1, -1), 9),
-        ("FONTNAME",      (0, 0), (0, -1),  FONT_BOLD),
-        ("TEXTCOLOR",     (0, 0), (0, -1),  NAVY),
-        ("FONTNAME",      (2, 0), (2, -1),  FONT_BOLD),
-        ("TEXTCOLOR",     (2, 0), (2, -1),  NAVY),
-        ("VALIGN",        (0, 0), (-1, -1), "BOTTOM"),
-        ("TOPPADDING",    (0, 0), (-1, -1), 10),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-    ]))
+    so_t.setStyle(_SIGN_OFF_STYLE)
     story.append(so_t)
     story.append(Spacer(1, 0.5 * inch))
 
     story.append(HRFlowable(width="100%", thickness=0.5, color=RULE_GREY))
     story.append(Spacer(1, 0.1 * inch))
     story.append(Paragraph(
-        f"<i>End of Report \u2013 Generated {_date(include_time=True)}</i>",
+        f"<i>End of Report \u2013 Generated {_date(include_time=True, now=now)}</i>",
         S["Foot"]
     ))
 
-    doc.build(story, onFirstPage=_cover_page, onLaterPages=_header_footer)
+    doc.build(story, onFirstPage=_cover_page,
+              onLaterPages=partial(_header_footer, report_date=report_date))
+    if output is not None:
+        return output
     pdf_bytes = buffer.getvalue()
     buffer.close()
     return pdf_bytes
\ No newline at end of file
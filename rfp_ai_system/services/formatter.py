@@ -1,7 +1,16 @@
+import hashlib
 import json
 import re
+import threading
+from collections import OrderedDict
 from services.gemini_client import ask_gemini
 
+# Gemini's JSON for recently formatted tenders, keyed by a hash of the raw text
+# so re-analysing the same tender skips the LLM call. Bounded, LRU order.
+FORMAT_CACHE_SIZE = 256
+_format_cache = OrderedDict()
+_format_lock  = threading.Lock()
+
 
 def extract_json(text: str) -> str:
     """
@@ -14,6 +23,14 @@ def extract_json(text: str) -> str:
 
 
 def format_rfp(raw_text: str) -> dict:
+    key = hashlib.blake2b(raw_text.encode(), digest_size=16).hexdigest()
+    with _format_lock:
+        cached = _format_cache.get(key)
+        if cached is not None:
+            _format_cache.move_to_end(key)
+    if cached is not None:
+        return json.loads(cached)   # fresh dict — callers update() the result
+
     prompt = f"""
 You are an AI system that extracts structured data from government tenders.
 
@@ -41,5 +58,10 @@ Tender text:
     response = ask_gemini(prompt)
 
     json_text = extract_json(response)
+    result = json.loads(json_text)   # only valid JSON gets cached
 
-    return json.loads(json_text)
+    with _format_lock:
+        _format_cache[key] = json_text
+        if len(_format_cache) > FORMAT_CACHE_SIZE:
+            _format_cache.popitem(last=False)
+    return result
@@ -0,0 +1,101 @@
+# services/pdf_extract.py
+"""
+PDF text extraction with pluggable engines.
+
+  fitz    — PyMuPDF (optional, fastest)
+  pdfium  — pypdfium2 (optional, C++ text extractor)
+  pypdf2  — PyPDF2 (always installed, slowest)
+
+extract_with_fallback() tries the installed engines in order until one
+returns enough text, and bounds each attempt with a timeout so a
+pathological PDF cannot pin a Flask worker.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import PyPDF2
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+MIN_TEXT_CHARS  = 100   # less than this counts as a failed extraction
+EXTRACT_TIMEOUT = 30    # seconds per engine
+
+
+def _fitz(path: str) -> str:
+    with fitz.open(path) as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def _pdfium(path: str) -> str:
+    doc = pypdfium2.PdfDocument(path)
+    try:
+        return "\n".join(page.get_textpage().get_text_range() for page in doc)
+    finally:
+        doc.close()
+
+
+def _pypdf2(path: str) -> str:
+    with open(path, "rb") as f:
+        return "\n".join(page.extract_text() for page in PyPDF2.PdfReader(f).pages)
+
+
+ENGINES = {
+    "fitz":   (_fitz,   fitz is not None),
+    "pdfium": (_pdfium, pypdfium2 is not None),
+    "pypdf2": (_pypdf2, True),
+}
+
+
+def available_engines() -> list:
+    """Installed engine names, preferred first."""
+    return [name for name, (_, installed) in ENGINES.items() if installed]
+
+
+def extract(path: str, engine: str = None) -> str:
+    """Extract text with one engine (default: the first installed one)."""
+    engine = engine or available_engines()[0]
+    func, installed = ENGINES[engine]
+    if not installed:
+        raise ValueError(f"PDF engine '{engine}' is not installed")
+    return func(path).strip()
+
+
+def extract_with_fallback(path: str, timeout: float = EXTRACT_TIMEOUT) -> str:
+    """
+    Try each installed engine until one yields at least MIN_TEXT_CHARS.
+    Returns the longest text seen (possibly short/empty if all fail);
+    raises only if every engine errored or timed out.
+
+    Each attempt gets its own single-thread executor, so the timeout only
+    counts extraction time and a hung engine strands just its own thread
+    instead of blocking later uploads behind a shared pool.
+    """
+    best, errors = None, []
+    for engine in available_engines():
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-extract")
+        try:
+            text = pool.submit(extract, path, engine).result(timeout=timeout)
+        except FutureTimeout:
+            errors.append(f"{engine}: timed out after {timeout}s")
+            continue
+        except Exception as e:
+            errors.append(f"{engine}: {e}")
+            continue
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if len(text) >= MIN_TEXT_CHARS:
+            return text
+        if best is None or len(text) > len(best):
+            best = text
+
+    if best is None:
+        raise Exception("Failed to extract text from PDF: " + "; ".join(errors))
+    return best
@@ -4,12 +4,42 @@ Supabase Client — centralised DB helper for all agents.
 """
 
 import os
-from datetime import datetime, date
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timezone
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:          # optional speed-up; stdlib json is the fallback
+    orjson = None
+
 load_dotenv()
 
 _client = None
+_push_pool = None   # created on first use so forked workers don't inherit it
+_push_lock = threading.Lock()
+
+
+def to_json_safe(obj):
+    """
+    Return a JSON-compatible deep copy of obj for a jsonb column.
+
+    Anything json can't encode natively (numpy scalars, timestamps, ...) is
+    passed through str(). Uses orjson when installed, which also encodes
+    numpy values as numbers and NaN as null, falling back to the stdlib
+    encoder for anything orjson rejects (e.g. ints wider than 64 bits).
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(orjson.dumps(
+                obj, default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            ))
+        except orjson.JSONEncodeError:
+            pass
+    return json.loads(json.dumps(obj, default=str))
 
 
 def get_supabase_client():
@@ -40,6 +70,21 @@ def push_to_table(table: str, data: dict):
         return None
 
 
+def push_to_table_async(table: str, data: dict):
+    """
+    Queue push_to_table on a background thread and return its Future, so
+    agents don't wait on the DB round-trip. Pass data that won't be mutated
+    afterwards (e.g. a to_json_safe copy). One worker keeps inserts in
+    submission order; pending pushes are flushed at interpreter exit.
+    """
+    global _push_pool
+    if _push_pool is None:
+        with _push_lock:    # request threads may get here at once
+            if _push_pool is None:
+                _push_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-push")
+    return _push_pool.submit(push_to_table, table, data)
+
+
 def upsert_to_table(table: str, data: dict):
     """Upsert a row (insert or update on conflict). Returns the response or None."""
     sb = get_supabase_client()
@@ -54,13 +99,13 @@ def upsert_to_table(table: str, data: dict):
         return None
 
 
-def get_from_table(table: str, filters: dict = None):
-    """Query rows from a table with optional eq filters."""
+def get_from_table(table: str, filters: dict = None, columns: str = "*"):
+    """Query rows from a table with optional eq filters (columns: select list)."""
     sb = get_supabase_client()
     if sb is None:
         return []
     try:
-        q = sb.table(table).select("*")
+        q = sb.table(table).select(columns)
         if filters:
             for col, val in filters.items():
                 q = q.eq(col, val)
@@ -82,6 +127,8 @@ def move_expired_tenders():
 
     today_str = date.today().isoformat()  # 'YYYY-MM-DD'
 
+    expired_at = datetime.now(timezone.utc).isoformat()
+
     try:
         # Fetch tenders with deadline before today
         expired = (
@@ -105,7 +152,7 @@ def move_expired_tenders():
                 "category":            row.get("category"),
                 "submission_deadline":  row.get("submission_deadline"),
                 "tender_data":         row.get("tender_data"),
-                "expired_at":          datetime.utcnow().isoformat(),
+                "expired_at":          expired_at,
             }
             sb.table("expired_tenders").insert(expired_row).execute()
 
@@ -1,4 +1,9 @@
 import pandas as pd
 
 def load_oem(path):
-    return pd.read_excel(path, sheet_name='Product Catalog')
\ No newline at end of file
+    return pd.read_excel(path, sheet_name='Product Catalog')
+
+def load_sheets(path, sheet_names):
+    # One workbook open/parse for several sheets; returns {sheet_name: DataFrame}
+    with pd.ExcelFile(path) as xls:
+        return pd.read_excel(xls, sheet_name=list(sheet_names))
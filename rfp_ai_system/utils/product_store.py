@@ -0,0 +1,105 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _factorize(values, norm) -> Tuple[np.ndarray, tuple]:
+    """Codes per row plus the normalized distinct values they index into."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes, tuple(norm(u) for u in uniques)
+
+
+def _lower(v) -> str:
+    return str(v).lower()
+
+
+def _voltage_key(v) -> str:
+    return re.sub(r'[^\w]', '', str(v).lower())
+
+
+@dataclass(frozen=True, slots=True)
+class ProductStore:
+    """
+    Column-wise (struct-of-arrays) view of the product catalogue.
+
+    Every array is aligned with the catalogue rows. String normalisation is
+    done once here, so scoring only indexes and sums; text columns are kept
+    factorized so a per-RFP test runs once per distinct value.
+    """
+    product_id:         np.ndarray
+    category:           np.ndarray
+    bis_certified:      np.ndarray       # raw values, for display
+    pid_to_idx:         Dict[str, int]   # first row wins on duplicate IDs
+
+    # Quick-match spec columns: codes index into the normalized uniques
+    voltage_codes:      np.ndarray
+    voltage_uniques:    tuple            # lower-case, non-word chars stripped
+    conductor_codes:    np.ndarray
+    conductor_uniques:  tuple            # lower-case
+    insulation_codes:   np.ndarray
+    insulation_uniques: tuple            # lower-case
+
+    # Scoring inputs
+    unit_cost:          np.ndarray       # unit price × MOQ
+    lead_time:          np.ndarray
+    high_moq:           np.ndarray       # MOQ > 500
+    bis_yes:            np.ndarray
+    std_hit:            np.ndarray       # standards mention is/iec/ieee/iso
+    warranty_capped:    np.ndarray       # min(warranty, 5)
+
+    # Line-item matcher inputs, for every catalogue column
+    columns:            Dict[str, np.ndarray]   # raw values
+    text_codes:         Dict[str, np.ndarray]   # codes into text_values
+    text_values:        Dict[str, tuple]        # distinct values as str
+
+    def __len__(self) -> int:
+        return self.product_id.size
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "ProductStore":
+        ids = df['Product_ID'].to_numpy()
+        moq = df['Min_Order_Qty_Meters'].to_numpy()
+        v_codes, v_uniques = _factorize(df['Voltage_Rating'], _voltage_key)
+        c_codes, c_uniques = _factorize(df['Conductor_Material'], _lower)
+        i_codes, i_uniques = _factorize(df['Insulation_Type'], _lower)
+
+        text_codes, text_values = {}, {}
+        for col in df.columns:
+            text_codes[col], text_values[col] = _factorize(df[col], str)
+
+        pid_to_idx = {}
+        for i, pid in enumerate(ids.tolist()):
+            pid_to_idx.setdefault(pid, i)
+
+        return cls(
+            product_id         = ids,
+            category           = df['Category'].to_numpy(),
+            bis_certified      = df['BIS_Certified'].to_numpy(),
+            pid_to_idx         = pid_to_idx,
+            voltage_codes      = v_codes,
+            voltage_uniques    = v_uniques,
+            conductor_codes    = c_codes,
+            conductor_uniques  = c_uniques,
+            insulation_codes   = i_codes,
+            insulation_uniques = i_uniques,
+            unit_cost          = df['Unit_Price_INR_per_meter'].to_numpy(dtype=np.float64) * moq,
+            lead_time          = df['Lead_Time_Days'].to_numpy(),
+            high_moq           = moq > 500,
+            bis_yes            = np.array(
+                [_lower(v) == 'yes' for v in df['BIS_Certified']], dtype=bool),
+            std_hit            = np.array(
+                [any(s in _lower(v) for s in ['is', 'iec', 'ieee', 'iso'])
+                 for v in df['Standards_Compliance']], dtype=bool),
+            warranty_capped    = np.minimum(df['Warranty_Years'].to_numpy(), 5),
+            columns            = {col: df[col].to_numpy() for col in df.columns},
+            text_codes         = text_codes,
+            text_values        = text_values,
+        )
+
+    def rows(self, product_ids) -> list:
+        """Row positions of the given IDs, skipping any not in the catalogue."""
+        lookup = self.pid_to_idx
+        return [lookup[pid] for pid in product_ids if pid in lookup]
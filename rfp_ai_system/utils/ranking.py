@@ -0,0 +1,21 @@
+import numpy as np
+
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, best first, ties in original order —
+    the same result as np.argsort(-scores, kind="stable")[:k], but O(n)
+    selection via np.partition plus a sort of only the k winners.
+    """
+    scores = np.asarray(scores)
+    n = scores.size
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    kth    = np.partition(scores, n - k)[n - k]          # k-th largest value
+    above  = np.flatnonzero(scores > kth)
+    ties   = np.flatnonzero(scores == kth)[: k - above.size]
+    picked = np.concatenate([above, ties])
+    return picked[np.lexsort((picked, -scores[picked]))]